@@ -0,0 +1,81 @@
+# Import libraries ------------------------------------------------
+import math
+import sys
+import os
+
+from artifact_store import load_family_data, load_accounting_table, load_accounting_options
+from tour_model import PhaseTimer, build_problem, start_values, assignment_from_values
+from solver_backend import make_backend
+from solution_io import read_warm_start, export_solution, write_solution_sol
+from telemetry import Telemetry, JsonlSink, PrometheusSink
+from mip_heuristic import IncumbentPolisher
+from checkpoint import Checkpointer, load_checkpoint
+
+# Read CSV --------------------------------------------------------
+timer = PhaseTimer()
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+accounting_options = load_accounting_options('attempt_09/inputs/family_data.csv', accounting_cutoff=300)
+os.makedirs('attempt_09/outputs', exist_ok=True)
+timer.lap('load_arrays')
+
+# Initiate model --------------------------------------------------
+solver = 'gurobi'  # <-- 'highs' runs without a Gurobi license
+problem = build_problem(family_members, family_choices, preference_cost, accounting_cost, accounting_options,
+                        timer=timer)
+backend = make_backend(solver, problem, timer=timer)
+
+# Set warm start --------------------------------------------------
+checkpoint_path = 'attempt_09/outputs/tour_model_checkpoint.npz'
+resume = '--resume' in sys.argv  # <-- continue from the last checkpointed incumbent and its parameters
+parameters = {'MIPFocus': 2} if solver == 'gurobi' else {}
+
+if resume:
+    metadata, arrays = load_checkpoint(checkpoint_path)
+    warm_start, parameters = arrays['assignment'], metadata['parameters']
+    print('Resuming from a {:,.2f} incumbent.'.format(metadata['cost']))
+else:
+    warm_start = read_warm_start('attempt_08/outputs/tour_solution_68898.csv')  # <-- any CSV or .sol from earlier
+
+backend.set_start(start_values(problem, warm_start, family_members))
+timer.lap('warm_start')
+
+for phase, seconds in timer.timings.items():
+    print('{:<22s}{:>10.2f}s'.format(phase, seconds))
+
+# Set parameters --------------------------------------------------
+for name, value in parameters.items():
+    backend.set_param(name, value)
+
+if solver == 'gurobi':
+    backend.set_param('LogFile', 'attempt_09/outputs/gurobi.log')  # <-- follow it live with 13_telemetry.py
+
+# Solve model -----------------------------------------------------
+telemetry = Telemetry([JsonlSink('attempt_09/outputs/telemetry.jsonl'),
+                       PrometheusSink('attempt_09/outputs/telemetry.prom')])
+polish_incumbents = True  # <-- swap-search incumbents and node roundings, and hand improvements back to the MIP
+polisher = IncumbentPolisher(problem, family_members, family_choices, preference_cost, accounting_cost,
+                             polish=polish_incumbents, checkpointer=Checkpointer(checkpoint_path, interval=0),
+                             parameters=parameters, callback=telemetry.callback('polisher'))
+result = backend.solve(on_progress=telemetry.callback(solver), heuristic=polisher)
+telemetry.close()
+
+# Extract solution for Kaggle -------------------------------------
+# Without a solver solution, fall back to the polisher's best schedule or the warm start
+if result.values is not None:
+    assignment = assignment_from_values(problem, result.values)
+else:
+    assignment = polisher.best_assignment if polisher.best_assignment is not None else warm_start
+    print('No solution from the solver ({}), exporting the best known schedule.'.format(result.status))
+
+preference_penalty, accounting_penalty = export_solution('attempt_09/outputs/tour_solution_%d.csv', assignment,
+                                                         preference_cost, family_members)
+current_cost = preference_penalty + accounting_penalty
+
+print('')
+print('Exported a schedule scoring {:,.2f} ({:,d} preference, {:,.2f} accounting).'
+      .format(current_cost, preference_penalty, accounting_penalty))
+
+# Write solution to file ------------------------------------------
+write_solution_sol('attempt_09/outputs/tour_solution_%d.sol' % math.floor(current_cost), assignment, family_members,
+                   current_cost)
@@ -0,0 +1,47 @@
+# Import libraries ------------------------------------------------
+import math
+import os
+
+from artifact_store import load_family_data, load_accounting_table
+from scoring import DeltaEvaluator
+from solution_io import read_assignment, write_solution_csv, write_solution_sol
+from local_search import LocalSearch
+from telemetry import Telemetry, JsonlSink, PrometheusSink
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Read in warm start ----------------------------------------------
+warm_start = 'attempt_08/outputs/tour_solution_77251.csv'  # <-- or preference_start.csv from 06
+assignment = read_assignment(warm_start)
+
+# Run local search ------------------------------------------------
+evaluator = DeltaEvaluator(assignment, preference_cost, family_members, accounting_cost)
+local_search = LocalSearch(evaluator, family_choices, seed=2019)
+
+output_string = '{:<8{}}{:<14{}}{:<14{}}{:<12{}}{:<16{}}{:<14{}}{:<{}}'
+print(output_string.format('SWEEP', 's', 'MOVE', 's', 'EVALUATED', 's', 'ACCEPTED', 's', 'CURRENT COST', 's',
+                           'MOVES/S', 's', 'RUN TIME', '11s'))
+print('-' * 90)
+
+
+def print_progress(stats):
+    print(output_string.format(stats['sweep'], 'd', stats['neighbourhood'], 's', stats['evaluated'], ',d',
+                               stats['accepted'], ',d', stats['cost'], ',.2f',
+                               stats['evaluated'] / max(stats['run_time'], 1e-9), ',.0f', stats['run_time'], '11.2f'))
+
+
+start_cost = evaluator.total_cost
+telemetry = Telemetry([JsonlSink('attempt_09/outputs/telemetry.jsonl'),
+                       PrometheusSink('attempt_09/outputs/telemetry.prom')])
+current_cost = local_search.run(callback=telemetry.callback('local_search', print_progress))
+telemetry.close()
+
+print('')
+print('Reduced cost from {:,.2f} to {:,.2f}.'.format(start_cost, current_cost))
+
+# Write solution to file ------------------------------------------
+write_solution_sol('attempt_09/outputs/tour_solution.sol', evaluator.assignment, family_members, current_cost)
+write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(current_cost), evaluator.assignment)
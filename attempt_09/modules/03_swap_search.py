@@ -0,0 +1,43 @@
+# Import libraries ------------------------------------------------
+import math
+import os
+
+from artifact_store import load_family_data, load_accounting_table
+from scoring import score
+from solution_io import read_assignment, write_solution_csv, write_solution_sol
+from swap_search import swap_search, NUMBA_AVAILABLE
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Read in warm start ----------------------------------------------
+warm_start = 'attempt_08/outputs/tour_solution_68898.csv'  # <-- or preference_start.csv from 06
+assignment = read_assignment(warm_start)
+start_cost = sum(score(assignment, preference_cost, family_members)[:2])
+
+# Run swap and chain search ---------------------------------------
+output_string = '{:<8{}}{:<16{}}{:<12{}}{:<16{}}{:<14{}}{:<{}}'
+print('Compiled with Numba.' if NUMBA_AVAILABLE else 'Numba not available, using the NumPy fallback.')
+print(output_string.format('SWEEP', 's', 'EVALUATED', 's', 'ACCEPTED', 's', 'CURRENT COST', 's',
+                           'MOVES/S', 's', 'RUN TIME', '11s'))
+print('-' * 80)
+
+
+def print_progress(stats):
+    print(output_string.format(stats['sweep'], 'd', stats['evaluated'], ',d', stats['accepted'], ',d',
+                               stats['cost'], ',.2f', stats['moves_per_second'], ',.0f', stats['run_time'], '11.2f'))
+
+
+assignment, stats = swap_search(assignment, family_members, preference_cost, family_choices, accounting_cost,
+                                top_k=5, seed=2019, callback=print_progress)
+current_cost = sum(score(assignment, preference_cost, family_members)[:2])
+
+print('')
+print('Reduced cost from {:,.2f} to {:,.2f}.'.format(start_cost, current_cost))
+
+# Write solution to file ------------------------------------------
+if current_cost < start_cost:
+    write_solution_sol('attempt_09/outputs/tour_solution.sol', assignment, family_members, current_cost)
+    write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(current_cost), assignment)
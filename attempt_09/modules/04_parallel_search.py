@@ -0,0 +1,45 @@
+# Import libraries ------------------------------------------------
+import math
+import os
+
+from artifact_store import load_family_data, load_accounting_table
+from solution_io import write_solution_csv, write_solution_sol
+from solution_archive import SolutionArchive
+from parallel_search import parallel_search
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Run parallel search ---------------------------------------------
+engine = 'local_search'  # <-- or 'annealing'
+
+if __name__ == '__main__':
+    # Read in warm starts -----------------------------------------
+    # Only the parent process touches the archive, however workers are started
+    archive = SolutionArchive()
+    archive.import_files('attempt_08/outputs/tour_solution_*.csv', preference_cost, family_members)
+    warm_starts = [solution.assignment for solution in archive.top(20)]
+
+    best_assignment, best_cost, worker_stats = parallel_search(warm_starts, preference_cost, family_members,
+                                                               family_choices, accounting_cost, engine=engine,
+                                                               time_limit=600, seed=2019)
+
+    output_string = '{:<8{}}{:<16{}}{:<16{}}{:<12{}}{:<11{}}{:<{}}'
+    print(output_string.format('WORKER', 's', 'COST', 's', 'EVALUATED', 's', 'ACCEPTED', 's', 'PUBLISHED', 's',
+                               'ADOPTED', 's'))
+    print('-' * 70)
+
+    for stats in worker_stats:
+        print(output_string.format(stats['worker'], 'd', stats['cost'], ',.2f', stats['evaluated'], ',d',
+                                   stats['accepted'], ',d', stats['published'], 'd', stats['adopted'], 'd'))
+
+    print('')
+    print('Best cost found: {:,.2f}'.format(best_cost))
+
+    # Write solution to file --------------------------------------
+    archive.add(best_assignment, preference_cost, family_members, 'attempt_09', {'engine': engine, 'seed': 2019})
+    write_solution_sol('attempt_09/outputs/tour_solution.sol', best_assignment, family_members, best_cost)
+    write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(best_cost), best_assignment)
+    archive.close()
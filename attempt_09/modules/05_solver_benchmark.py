@@ -0,0 +1,64 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import json
+import os
+
+from artifact_store import load_family_data, load_accounting_table, load_accounting_options
+from tour_model import PhaseTimer, build_window_problem
+from solver_backend import make_backend, available_backends
+from solution_io import read_assignment
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+accounting_options = load_accounting_options('attempt_09/inputs/family_data.csv', accounting_cutoff=300)
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Define reduced instances ----------------------------------------
+# Each instance frees the families assigned to a window of days and keeps everyone else fixed
+assignment = read_assignment('attempt_08/outputs/tour_solution_70229.csv')
+instances = [{'first_day': 40, 'window': 3},
+             {'first_day': 40, 'window': 5},
+             {'first_day': 1, 'window': 10},
+             {'first_day': 60, 'window': 20}]
+time_limit = 600
+target_gap = 0.0001
+
+# Run each backend on each instance -------------------------------
+output_string = '{:<11{}}{:<8{}}{:<10{}}{:<12{}}{:<12{}}{:<12{}}{:<16{}}{:<12{}}{:<{}}'
+print(output_string.format('FIRST DAY', 's', 'DAYS', 's', 'COLUMNS', 's', 'SOLVER', 's', 'STATUS', 's',
+                           'BUILD', 's', 'FIRST FEASIBLE', 's', 'TARGET GAP', 's', 'OBJECTIVE', 's'))
+print('-' * 110)
+
+benchmark = []
+
+for instance in instances:
+    window_days = np.arange(instance['first_day'], min(instance['first_day'] + instance['window'], 101))
+    problem, fixed_cost = build_window_problem(assignment, window_days, family_members, family_choices,
+                                               preference_cost, accounting_cost, accounting_options)
+
+    for solver in available_backends():
+        timer = PhaseTimer()
+
+        try:
+            backend = make_backend(solver, problem, timer=timer)
+            result = backend.solve(time_limit=time_limit, mip_gap=target_gap, target_gap=target_gap)
+        except Exception as e:
+            print('{} could not solve this instance: {}'.format(solver, e))
+            continue
+
+        objective = None if result.objective is None else result.objective + fixed_cost
+        benchmark.append(dict(instance, solver=solver, columns=len(problem.objective), status=result.status,
+                              objective=objective, bound=result.bound + fixed_cost, run_time=result.run_time,
+                              build_time=sum(timer.timings.values()), first_feasible_time=result.first_feasible_time,
+                              target_gap_time=result.target_gap_time))
+
+        print(output_string.format(instance['first_day'], 'd', instance['window'], 'd', len(problem.objective), ',d',
+                                   solver, 's', result.status, 's', '%.2fs' % sum(timer.timings.values()), 's',
+                                   '-' if result.first_feasible_time is None else '%.2fs' % result.first_feasible_time,
+                                   's', '-' if result.target_gap_time is None else '%.2fs' % result.target_gap_time,
+                                   's', '-' if objective is None else '{:,.2f}'.format(objective), 's'))
+
+# Write benchmark to file -----------------------------------------
+with open('attempt_09/outputs/solver_benchmark.json', 'w') as f:
+    json.dump({'time_limit': time_limit, 'target_gap': target_gap, 'results': benchmark}, f, indent=2)
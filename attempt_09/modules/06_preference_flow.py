@@ -0,0 +1,35 @@
+# Import libraries ------------------------------------------------
+import os
+
+from artifact_store import load_family_data
+from scoring import score
+from solution_io import write_solution_csv, write_solution_sol
+from preference_flow import preference_flow, round_flow, repair_assignment, NUMBA_AVAILABLE
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Solve preference-only flow --------------------------------------
+print('Compiled with Numba.' if NUMBA_AVAILABLE else 'Numba not available, using the NumPy fallback.')
+flow, stats = preference_flow(family_members, family_choices, preference_cost)
+
+print('Sent {:,d} families through {:,d} shortest paths in {:.2f}s, leaving {:,d} families split across days.'
+      .format(len(family_members), stats['augmentations'], stats['run_time'], stats['split_families']))
+
+# Round to whole families -----------------------------------------
+assignment = repair_assignment(round_flow(flow, family_choices), family_members, preference_cost, family_choices)
+preference_penalty, accounting_penalty, _ = score(assignment, preference_cost, family_members)
+gap = (preference_penalty - stats['lower_bound']) / preference_penalty
+
+print('')
+print('{:<24s}{:>20,.2f}'.format('LP bound', stats['lower_bound']))
+print('{:<24s}{:>20,.2f}'.format('Preference cost', preference_penalty))
+print('{:<24s}{:>19.2f}%'.format('Gap to LP bound', 100 * gap))
+print('{:<24s}{:>20,.2f}'.format('Accounting cost', accounting_penalty))
+
+# Write warm start to file ----------------------------------------
+# 02_local_search.py and 03_swap_search.py can start from this schedule instead of an attempt_08 solution
+write_solution_sol('attempt_09/outputs/tour_solution.sol', assignment, family_members,
+                   preference_penalty + accounting_penalty)
+write_solution_csv('attempt_09/outputs/preference_start.csv', assignment)
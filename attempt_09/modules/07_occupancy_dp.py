@@ -0,0 +1,47 @@
+# Import libraries ------------------------------------------------
+import math
+import os
+
+from artifact_store import load_family_data, load_accounting_table
+from scoring import score
+from solution_io import read_assignment, write_solution_csv, write_solution_sol
+from occupancy_dp import occupancy_band, cheapest_profile, match_profile
+from swap_search import swap_search
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Read in target profile ------------------------------------------
+target = read_assignment('attempt_08/outputs/tour_solution_68898.csv')
+target_preference, target_accounting, target_occupancy = score(target, preference_cost, family_members)
+band = 15  # <-- people either side of the target attendance on each day
+tolerance = 4  # <-- people either side of the profile that the assignment stage may miss by
+
+# Find cheapest occupancy profile ---------------------------------
+lower, upper = occupancy_band(target_occupancy, band)
+profile, profile_accounting = cheapest_profile(lower, upper, family_members.sum(), accounting_cost)
+
+print('{:<28s}{:>14,.2f}'.format('Target accounting cost', target_accounting))
+print('{:<28s}{:>14,.2f}'.format('Profile accounting cost', profile_accounting))
+
+# Match profile with families -------------------------------------
+assignment, stats = match_profile(profile, family_members, family_choices, preference_cost, tolerance=tolerance)
+preference_penalty, accounting_penalty, _ = score(assignment, preference_cost, family_members)
+
+print('{:<28s}{:>14,.2f}'.format('Matching LP bound', stats['lower_bound']))
+print('{:<28s}{:>14,.2f}'.format('Matched preference cost', preference_penalty))
+print('{:<28s}{:>14,.2f}'.format('Matched accounting cost', accounting_penalty))
+
+# Polish with swap and chain search -------------------------------
+assignment, _ = swap_search(assignment, family_members, preference_cost, family_choices, accounting_cost,
+                            top_k=5, time_limit=120, seed=2019)
+preference_penalty, accounting_penalty, _ = score(assignment, preference_cost, family_members)
+current_cost = preference_penalty + accounting_penalty
+
+print('{:<28s}{:>14,.2f}'.format('Polished cost', current_cost))
+
+# Write solution to file ------------------------------------------
+write_solution_sol('attempt_09/outputs/tour_solution.sol', assignment, family_members, current_cost)
+write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(current_cost), assignment)
@@ -0,0 +1,52 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import math
+import os
+
+from artifact_store import load_family_data, load_accounting_table
+from scoring import score
+from solution_io import read_assignment, write_solution_csv, write_solution_sol
+from lagrangian import lagrangian_search
+from swap_search import swap_search
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Read in best known solution for the step size -------------------
+incumbent = read_assignment('attempt_08/outputs/tour_solution_68898.csv')
+upper_bound = sum(score(incumbent, preference_cost, family_members)[:2])
+
+# Run subgradient steps -------------------------------------------
+output_string = '{:<12{}}{:<14{}}{:<14{}}{:<18{}}{:<18{}}{:<12{}}{:<{}}'
+print(output_string.format('ITERATION', 's', 'BOUND', 's', 'BEST BOUND', 's', 'REPAIRED COST', 's',
+                           'BEST REPAIRED', 's', 'VIOLATION', 's', 'RUN TIME', '11s'))
+print('-' * 100)
+
+
+def print_progress(stats):
+    if stats['iteration'] % 10 == 0:
+        print(output_string.format(stats['iteration'], 'd', stats['bound'], ',.2f', stats['best_bound'], ',.2f',
+                                   stats['cost'], ',.2f', stats['best_cost'], ',.2f', stats['violation'], ',d',
+                                   stats['run_time'], '11.2f'))
+
+
+assignment, stats = lagrangian_search(family_members, family_choices, preference_cost, accounting_cost,
+                                      upper_bound=upper_bound, max_iterations=300, callback=print_progress)
+
+print('')
+print('Lower bound of {:,.2f}, {:.2f}% below the best known {:,.2f}.'
+      .format(stats['best_bound'], 100 * (upper_bound - stats['best_bound']) / upper_bound, upper_bound))
+
+# Polish best repaired solution -----------------------------------
+assignment, _ = swap_search(assignment, family_members, preference_cost, family_choices, accounting_cost,
+                            top_k=5, time_limit=120, seed=2019)
+current_cost = sum(score(assignment, preference_cost, family_members)[:2])
+
+print('Polished the best repaired solution to {:,.2f}.'.format(current_cost))
+
+# Write solution and multipliers to file --------------------------
+np.save('attempt_09/outputs/lagrangian_multipliers.npy', stats['best_multipliers'])
+write_solution_sol('attempt_09/outputs/tour_solution.sol', assignment, family_members, current_cost)
+write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(current_cost), assignment)
@@ -0,0 +1,50 @@
+# Import libraries ------------------------------------------------
+import math
+import sys
+import os
+
+from artifact_store import load_family_data, load_accounting_table
+from scoring import DeltaEvaluator
+from solution_io import read_assignment, write_solution_csv, write_solution_sol
+from local_search import LocalSearch
+from annealing import SimulatedAnnealing
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Read in warm start ----------------------------------------------
+warm_start = 'attempt_08/outputs/tour_solution_77251.csv'  # <-- or preference_start.csv from 06
+assignment = read_assignment(warm_start)
+
+# Run simulated annealing -----------------------------------------
+evaluator = DeltaEvaluator(assignment, preference_cost, family_members, accounting_cost)
+annealing = SimulatedAnnealing(LocalSearch(evaluator, family_choices), seed=2019)
+checkpoint_path = 'attempt_09/outputs/annealing_checkpoint.npz'
+
+if '--resume' in sys.argv:  # <-- continue an interrupted run from its last checkpoint
+    annealing.restore(checkpoint_path)
+
+output_string = '{:<12{}}{:<14{}}{:<12{}}{:<14{}}{:<16{}}{:<16{}}{:<10{}}{:<{}}'
+print(output_string.format('RUN TIME', 's', 'MOVES/S', 's', 'ACCEPTED', 's', 'TEMPERATURE', 's', 'CURRENT COST', 's',
+                           'BEST COST', 's', 'REHEATS', 's', 'RESTARTS', 's'))
+print('-' * 104)
+
+
+def print_progress(record):
+    print(output_string.format(record['run_time'], '.2f', record['moves_per_second'], ',.0f',
+                               record['acceptance_rate'], '.2%', record['temperature'], ',.2f', record['cost'], ',.2f',
+                               record['best_cost'], ',.2f', record['reheats'], 'd', record['restarts'], 'd'))
+
+
+start_cost = evaluator.total_cost
+best_cost = annealing.run(time_limit=600, checkpoint_path=checkpoint_path,
+                          log_path='attempt_09/outputs/annealing_log.jsonl', log_interval=30, callback=print_progress)
+
+print('')
+print('Reduced cost from {:,.2f} to {:,.2f}.'.format(start_cost, best_cost))
+
+# Write solution to file ------------------------------------------
+write_solution_sol('attempt_09/outputs/tour_solution.sol', annealing.best_assignment, family_members, best_cost)
+write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(best_cost), annealing.best_assignment)
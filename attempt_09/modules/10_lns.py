@@ -0,0 +1,46 @@
+# Import libraries ------------------------------------------------
+import math
+import sys
+import os
+
+from artifact_store import load_family_data, load_accounting_table, load_accounting_options
+from solution_io import read_assignment, write_solution_csv, write_solution_sol
+from lns import lns_search
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+accounting_options = load_accounting_options('attempt_09/inputs/family_data.csv', accounting_cutoff=300)
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Read in warm start ----------------------------------------------
+warm_start = 'attempt_08/outputs/tour_solution_77251.csv'  # <-- or preference_start.csv from 06
+assignment = read_assignment(warm_start)
+
+# Run destroy and repair rounds -----------------------------------
+solver = 'gurobi'  # <-- 'highs' runs without a Gurobi license
+n_workers = 1  # <-- windows repaired in parallel each round
+
+output_string = '{:<8{}}{:<10{}}{:<11{}}{:<16{}}{:<{}}'
+print(output_string.format('ROUND', 's', 'SOLVED', 's', 'IMPROVED', 's', 'CURRENT COST', 's', 'RUN TIME', '11s'))
+print('-' * 56)
+
+
+def print_progress(stats):
+    print(output_string.format(stats['round'], 'd', stats['solved'], 'd', stats['improved'], 'd', stats['cost'],
+                               ',.2f', stats['run_time'], '11.2f'))
+
+
+if __name__ == '__main__':
+    assignment, stats = lns_search(assignment, family_members, family_choices, preference_cost, accounting_cost,
+                                   accounting_options, solver=solver, window=3, sub_time_limit=30, time_limit=600,
+                                   n_workers=n_workers, seed=2019, callback=print_progress,
+                                   checkpoint_path='attempt_09/outputs/lns_checkpoint.npz',
+                                   resume='--resume' in sys.argv)  # <-- continue from the last checkpoint
+
+    print('')
+    print('Reduced cost from {:,.2f} to {:,.2f}.'.format(stats['start_cost'], stats['cost']))
+
+    # Write solution to file --------------------------------------
+    write_solution_sol('attempt_09/outputs/tour_solution.sol', assignment, family_members, stats['cost'])
+    write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(stats['cost']), assignment)
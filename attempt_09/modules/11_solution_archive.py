@@ -0,0 +1,37 @@
+# Import libraries ------------------------------------------------
+import glob
+
+from artifact_store import load_family_data
+from solution_archive import SolutionArchive
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+
+# Import stored solutions -----------------------------------------
+archive = SolutionArchive()
+added = 0
+
+for pattern in sorted(glob.glob('attempt_0*/outputs')):
+    added += archive.import_files(pattern + '/tour_solution_*.csv', preference_cost, family_members)
+
+print('Added {:,d} new solutions, {:,d} in the archive.'.format(added, len(archive)))
+print('')
+
+# Query archive ---------------------------------------------------
+best = archive.top(1)[0]
+keys, distance = archive.hamming(best.assignment)
+distance = dict(zip(keys, distance))
+
+output_string = '{:<20{}}{:<14{}}{:<14{}}{:<14{}}{:<14{}}{:<{}}'
+print(output_string.format('HASH', 's', 'SOURCE', 's', 'COST', 's', 'PREFERENCE', 's', 'ACCOUNTING', 's',
+                           'FROM BEST', 's'))
+print('-' * 90)
+
+for title, solutions in [('Cheapest', archive.top(5)), ('Most diverse under 69,000', archive.diverse(5, 69000))]:
+    print(title)
+
+    for s in solutions:
+        print(output_string.format(s.hash, 's', s.source, 's', s.cost, ',.2f', s.preference, ',.0f', s.accounting,
+                                   ',.2f', distance[s.hash], ',d'))
+
+archive.close()
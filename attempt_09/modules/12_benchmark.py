@@ -0,0 +1,43 @@
+# Import libraries ------------------------------------------------
+import os
+
+from benchmark import run_benchmarks, find_regressions, write_results, read_results
+
+# Run benchmarks --------------------------------------------------
+os.makedirs('attempt_09/outputs', exist_ok=True)
+baseline_path = 'attempt_09/artifacts/benchmark_baseline.json'
+save_baseline = False  # <-- True to make this run the baseline for later runs
+
+results = run_benchmarks('attempt_09/inputs/family_data.csv', 'attempt_08/outputs/tour_solution_68898.csv',
+                         'attempt_08/outputs/tour_solution_77251.csv')
+
+output_string = '{:<32{}}{:>16{}}  {:<{}}'
+print(output_string.format('STAGE', 's', 'VALUE', 's', 'UNIT', 's'))
+print('-' * 60)
+
+for name, metric in results['metrics'].items():
+    value_format = '{:,.4f}' if metric['unit'] == 's' else '{:,.0f}'
+    print(output_string.format(name, 's', '-' if metric['value'] is None else value_format.format(metric['value']),
+                               's', metric['unit'], 's'))
+
+# Write results to file -------------------------------------------
+write_results('attempt_09/outputs/benchmark_%s.json' % results['timestamp'][:19].replace(':', ''), results)
+
+# Compare against baseline ----------------------------------------
+if save_baseline or not os.path.exists(baseline_path):
+    os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+    write_results(baseline_path, results)
+    print('')
+    print('Saved this run as the baseline.')
+else:
+    baseline = read_results(baseline_path)
+    regressions = find_regressions(results, baseline)
+
+    print('')
+    print('Compared with the baseline from commit {} on {}.'.format(baseline['commit'], baseline['timestamp'][:10]))
+
+    for name, reference, value in regressions:
+        print('REGRESSION  {:<32s}{} -> {}'.format(name, reference, value))
+
+    if not regressions:
+        print('No regressions.')
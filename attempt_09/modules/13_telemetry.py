@@ -0,0 +1,47 @@
+# Import libraries ------------------------------------------------
+import os
+
+from telemetry import Telemetry, JsonlSink, PrometheusSink, parse_log
+
+# Choose log ------------------------------------------------------
+log_path = 'attempt_08/artifacts/gurobi.log'  # <-- or attempt_09/outputs/gurobi.log while 01 is running
+follow_log = False  # <-- True to keep reading as the solver appends
+serve_port = None  # <-- e.g. 9108 to expose /metrics while following
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Stream log into telemetry ---------------------------------------
+prometheus = PrometheusSink('attempt_09/outputs/gurobi_log.prom')
+telemetry = Telemetry([JsonlSink('attempt_09/outputs/gurobi_log.jsonl'), prometheus])
+
+if serve_port is not None:
+    prometheus.serve(serve_port)
+
+output_string = '{:<6{}}{:<12{}}{:<16{}}{:<16{}}{:<10{}}{:<12{}}{:<{}}'
+print(output_string.format('RUN', 's', 'NODES', 's', 'INCUMBENT', 's', 'BOUND', 's', 'GAP', 's', 'RUN TIME', 's',
+                           'CUTS', 's'))
+print('-' * 90)
+
+runs = {}
+
+for event in parse_log(log_path, follow_log):
+    run = runs.setdefault(event['run'], {'nodes': 0, 'incumbent': None, 'bound': None, 'gap': None, 'run_time': 0,
+                                         'cuts': 0})
+
+    if event['type'] in ('progress', 'summary', 'root', 'mip_start'):
+        telemetry.record('gurobi', **event)
+        run.update({k: v for k, v in event.items() if k in run and v is not None})
+    elif event['type'] == 'explored':
+        run.update(nodes=int(event['nodes']), run_time=event['run_time'])
+    elif event['type'] == 'cuts':
+        run['cuts'] = sum(event['cuts'].values())
+
+    # Print each run once its summary line arrives
+    if event['type'] == 'summary' and run['incumbent'] is not None:
+        print(output_string.format(event['run'], 'd', run['nodes'], ',d', run['incumbent'], ',.2f',
+                                   run['bound'] or 0, ',.2f', run['gap'] or 0, '.2%', run['run_time'], ',.0f',
+                                   run['cuts'], ',d'))
+
+telemetry.close()
+
+print('')
+print('Wrote {:,d} runs to attempt_09/outputs/gurobi_log.jsonl.'.format(len(runs)))
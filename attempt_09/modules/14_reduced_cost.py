@@ -0,0 +1,73 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import math
+import os
+
+from artifact_store import load_family_data, load_accounting_table, load_accounting_options
+from tour_model import build_problem
+from reduced_cost import lp_relaxation, ReducedCostFixing, fixing_search
+from solution_io import read_warm_start, write_solution_csv, write_solution_sol
+from scoring import score
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+accounting_cutoff = None  # <-- 300 reproduces attempt 08's model, and its LP solves in half the time
+accounting_options = load_accounting_options('attempt_09/inputs/family_data.csv', accounting_cutoff=accounting_cutoff)
+os.makedirs('attempt_09/outputs', exist_ok=True)
+os.makedirs('attempt_09/artifacts', exist_ok=True)
+
+# Solve LP relaxation once ----------------------------------------
+problem = build_problem(family_members, family_choices, preference_cost, accounting_cost, accounting_options)
+lp_path = 'attempt_09/artifacts/lp_relaxation_%s.npz' % accounting_cutoff
+
+if os.path.exists(lp_path):
+    with np.load(lp_path) as lp:
+        bound, reduced_cost = float(lp['bound']), lp['reduced_cost']
+else:
+    bound, reduced_cost = lp_relaxation(problem, solver='highs')
+    np.savez(lp_path, bound=bound, reduced_cost=reduced_cost)
+
+fixing = ReducedCostFixing(problem, bound, reduced_cost)
+
+# Report survivors ------------------------------------------------
+warm_start = read_warm_start('attempt_08/outputs/tour_solution_68898.csv')  # <-- any CSV or .sol from earlier
+incumbent = sum(score(warm_start, preference_cost, family_members)[:2])
+
+output_string = '{:<14{}}{:<10{}}{:<14{}}{:<16{}}{:<16{}}{:<{}}'
+print('LP bound {:,.2f}, {:,d} columns.'.format(bound, len(problem.objective)))
+print('')
+print(output_string.format('INCUMBENT', 's', 'GAP', 's', 'VISIT', 's', 'ACCOUNTING', 's', 'COLUMNS', 's',
+                           'SURVIVING', 's'))
+print('-' * 80)
+
+for cost in [incumbent + 2000, incumbent + 500, incumbent, incumbent - 500, bound + 500]:
+    survivors = fixing.survivors(cost)
+    print(output_string.format(cost, ',.0f', cost - bound, ',.0f', survivors['visit'], ',d', survivors['accounting'],
+                               ',d', survivors['columns'], ',d', survivors['columns'] / survivors['full_columns'],
+                               '.2%'))
+
+# Solve pruned MIP, re-pruning at each new incumbent --------------
+solver = 'gurobi'  # <-- 'highs' runs without a Gurobi license
+
+print('')
+print(output_string.format('ROUND', 's', 'STATUS', 's', 'COLUMNS', 's', 'BOUND', 's', 'CURRENT COST', 's',
+                           'RUN TIME', 's'))
+print('-' * 80)
+
+
+def print_progress(stats):
+    print(output_string.format(stats['round'], 'd', stats['status'], 's', stats['columns'], ',d', stats['bound'],
+                               ',.2f', stats['cost'], ',.2f', stats['run_time'], '.2f'))
+
+
+assignment, stats = fixing_search(fixing, warm_start, family_members, family_choices, preference_cost,
+                                  accounting_cost, solver=solver, time_limit=3600, callback=print_progress)
+
+print('')
+print('Reduced cost from {:,.2f} to {:,.2f}{}.'.format(stats['start_cost'], stats['cost'],
+                                                       ', proven optimal' if stats['optimal'] else ''))
+
+# Write solution to file ------------------------------------------
+write_solution_sol('attempt_09/outputs/tour_solution.sol', assignment, family_members, stats['cost'])
+write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(stats['cost']), assignment)
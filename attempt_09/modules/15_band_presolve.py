@@ -0,0 +1,67 @@
+# Import libraries ------------------------------------------------
+import math
+import os
+
+from artifact_store import load_family_data, load_accounting_table, load_accounting_options
+from solution_io import write_solution_csv, write_solution_sol
+from solution_archive import SolutionArchive
+from preference_flow import preference_flow
+from band_presolve import elite_bands, band_accounting_options, band_search
+
+# Read CSV --------------------------------------------------------
+family_members, family_choices, preference_cost = load_family_data('attempt_09/inputs/family_data.csv')
+accounting_cost = load_accounting_table('attempt_09/inputs/family_data.csv')
+accounting_options = load_accounting_options('attempt_09/inputs/family_data.csv')
+os.makedirs('attempt_09/outputs', exist_ok=True)
+
+# Read in reference schedules -------------------------------------
+archive = SolutionArchive()
+archive.import_files('attempt_08/outputs/tour_solution_*.csv', preference_cost, family_members)
+elites = archive.top(5)  # <-- more references give wider bands
+assignment, references = elites[0].assignment, [s.assignment for s in elites[1:]]
+archive.close()
+
+# No accounting pair can cost more than the incumbent less the preference flow's lower bound
+_, flow_stats = preference_flow(family_members, family_choices, preference_cost)
+max_pair_cost = elites[0].cost - flow_stats['lower_bound']
+
+# Report band sizes -----------------------------------------------
+output_string = '{:<8{}}{:<14{}}{:<14{}}{:<{}}'
+print('{:,d} accounting columns without bands.'.format(len(accounting_options[0])))
+print('')
+print(output_string.format('BAND', 's', 'MEAN WIDTH', 's', 'ACCOUNTING', 's', 'OF FULL', 's'))
+print('-' * 50)
+
+for band in [0, 5, 10, 20, 40]:
+    lower, upper = elite_bands([s.assignment for s in elites], family_members, band)
+    options = band_accounting_options(accounting_options, accounting_cost, lower, upper, max_pair_cost)
+    print(output_string.format(band, 'd', (upper - lower)[1:].mean() + 1, '.1f', len(options[0]), ',d',
+                               len(options[0]) / len(accounting_options[0]), '.2%'))
+
+# Solve inside the bands ------------------------------------------
+solver = 'gurobi'  # <-- 'highs' runs without a Gurobi license
+band = 5  # <-- people either side of the elite schedules, and the step each widening adds
+
+print('')
+output_string = '{:<8{}}{:<12{}}{:<12{}}{:<12{}}{:<16{}}{:<16{}}{:<10{}}{:<{}}'
+print(output_string.format('ROUND', 's', 'STATUS', 's', 'COLUMNS', 's', 'WIDTH', 's', 'BOUND', 's',
+                           'CURRENT COST', 's', 'WIDENED', 's', 'RUN TIME', 's'))
+print('-' * 96)
+
+
+def print_progress(stats):
+    print(output_string.format(stats['round'], 'd', stats['status'], 's', stats['columns'], ',d',
+                               stats['mean_width'], '.1f', stats['bound'], ',.2f', stats['cost'], ',.2f',
+                               stats['widened'], 'd', stats['run_time'], '.2f'))
+
+
+assignment, stats = band_search(assignment, references, family_members, family_choices, preference_cost,
+                                accounting_cost, accounting_options, band=band, max_pair_cost=max_pair_cost,
+                                solver=solver, time_limit=1800, callback=print_progress)
+
+print('')
+print('Reduced cost from {:,.2f} to {:,.2f}.'.format(stats['start_cost'], stats['cost']))
+
+# Write solution to file ------------------------------------------
+write_solution_sol('attempt_09/outputs/tour_solution.sol', assignment, family_members, stats['cost'])
+write_solution_csv('attempt_09/outputs/tour_solution_%d.csv' % math.floor(stats['cost']), assignment)
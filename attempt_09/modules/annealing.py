@@ -0,0 +1,238 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import random
+import math
+import json
+from datetime import datetime
+
+from checkpoint import save_checkpoint, load_checkpoint, random_state, set_random_state
+
+ANNEALING_NEIGHBOURHOODS = ('move', 'swap', 'choice_shift')
+
+
+# Define simulated annealing over the delta evaluator -------------
+# Moves send a family to a random choice, swaps exchange it with a family on that day, and choice shifts move it one
+# rank up or down its own choice list. The LocalSearch keeps the day membership that swaps draw from.
+class SimulatedAnnealing:
+    def __init__(self, local_search, temperature=None, cooling=0.99999, adapt_interval=20000, min_acceptance=0.002,
+                 reheat_factor=4.0, restart_after=3, pool_size=5, seed=None):
+        self.local_search = local_search
+        self.evaluator = local_search.evaluator
+        self.family_choices = local_search.family_choices
+        self.cooling = cooling
+        self.adapt_interval = adapt_interval
+        self.min_acceptance = min_acceptance
+        self.reheat_factor = reheat_factor
+        self.restart_after = restart_after
+        self.pool_size = pool_size
+
+        # Python's random is several times faster than NumPy for one draw at a time
+        self.random = random.Random(seed)
+        self.n_families = len(self.family_choices)
+
+        self.moves = 0
+        self.accepted = 0
+        self.uphill_tried = 0
+        self.uphill_accepted = 0
+        self.reheats = 0
+        self.reheats_since_best = 0
+        self.restarts = 0
+        self.pool = []
+        self.elapsed = 0.0
+        self.best_cost = self.evaluator.total_cost
+        self.best_assignment = self.evaluator.assignment.copy()
+        self.start_temperature = temperature or self.initial_temperature()
+        self.temperature = self.start_temperature
+
+    def initial_temperature(self, samples=500, acceptance=0.5):
+        # Accept the average uphill move with the given probability at the start
+        uphill = []
+
+        for _ in range(samples):
+            proposal = self.propose()
+
+            if proposal is not None and proposal[2] > 0:
+                uphill.append(proposal[2])
+
+        return -float(np.mean(uphill)) / math.log(acceptance) if uphill else 1.0
+
+    def propose(self):
+        evaluator = self.evaluator
+        neighbourhood = ANNEALING_NEIGHBOURHOODS[self.random.randrange(3)]
+        family = self.random.randrange(self.n_families)
+        choices = self.family_choices[family]
+        day = evaluator._assignment[family]
+
+        if neighbourhood == 'choice_shift':
+            rank = choices.index(day) if day in choices else -1
+            new_rank = rank + (1 if rank <= 0 or self.random.random() < 0.5 else -1)
+
+            if new_rank >= len(choices):
+                return None
+
+            new_day = choices[new_rank]
+        else:
+            new_day = choices[self.random.randrange(len(choices))]
+
+        if new_day == day:
+            return None
+
+        if neighbourhood == 'swap':
+            members = self.local_search.day_members[new_day]
+
+            if not members:
+                return None
+
+            other = self.random.choice(tuple(members))
+
+            if not evaluator.is_feasible_swap(family, other):
+                return None
+
+            return 'swap', (family, other), evaluator.swap_delta(family, other)
+
+        if not evaluator.is_feasible_move(family, new_day):
+            return None
+
+        return 'move', (family, new_day), evaluator.move_delta(family, new_day)
+
+    def step(self):
+        self.moves += 1
+        proposal = self.propose()
+
+        if proposal is None:
+            return
+
+        kind, arguments, delta = proposal
+
+        if delta > 0:
+            self.uphill_tried += 1
+
+            if self.random.random() >= math.exp(-delta / self.temperature):
+                return
+
+            self.uphill_accepted += 1
+
+        if kind == 'move':
+            self.local_search.apply_move(*arguments)
+        else:
+            self.local_search.apply_swap(*arguments)
+
+        self.accepted += 1
+
+        if self.evaluator.total_cost < self.best_cost - 1e-9:
+            self.best_cost = self.evaluator.total_cost
+            self.best_assignment = self.evaluator.assignment.copy()
+            self.reheats_since_best = 0
+
+    def update_pool(self):
+        # Keep the best few distinct schedules to restart from
+        if any(abs(cost - self.best_cost) < 1e-6 for cost, _ in self.pool):
+            return
+
+        self.pool.append((self.best_cost, self.best_assignment.copy()))
+        self.pool.sort(key=lambda entry: entry[0])
+        del self.pool[self.pool_size:]
+
+    def adapt(self):
+        # Reheat once uphill moves are almost never accepted, and restart from an elite after repeated reheats
+        rate = self.uphill_accepted / max(self.uphill_tried, 1)
+        self.uphill_tried = 0
+        self.uphill_accepted = 0
+        self.update_pool()
+
+        if rate >= self.min_acceptance:
+            return
+
+        self.temperature = min(self.temperature * self.reheat_factor, self.start_temperature)
+        self.reheats += 1
+        self.reheats_since_best += 1
+
+        if self.reheats_since_best >= self.restart_after:
+            _, assignment = self.pool[self.random.randrange(len(self.pool))]
+            self.local_search.reset(assignment)
+            self.restarts += 1
+            self.reheats_since_best = 0
+
+    def checkpoint(self, path, run_time=None):
+        # The full search state, so a resumed run carries on with the same temperature, pool and random stream
+        counters = ('moves', 'accepted', 'uphill_tried', 'uphill_accepted', 'reheats', 'reheats_since_best',
+                    'restarts', 'temperature', 'start_temperature', 'best_cost')
+        metadata = {name: getattr(self, name) for name in counters}
+        metadata.update(run_time=self.elapsed if run_time is None else run_time, random_state=random_state(self.random),
+                        pool_costs=[cost for cost, _ in self.pool])
+        pool = np.array([assignment for _, assignment in self.pool], dtype=np.int64).reshape(len(self.pool), -1)
+
+        save_checkpoint(path, metadata, assignment=self.evaluator.assignment,
+                        occupancy=self.evaluator.occupancy, best_assignment=self.best_assignment, pool=pool)
+
+    def restore(self, path):
+        metadata, arrays = load_checkpoint(path)
+        self.local_search.reset(arrays['assignment'])
+
+        if not np.array_equal(self.evaluator.occupancy, arrays['occupancy']):
+            raise ValueError('Checkpoint occupancy does not match its assignment, check the family data')
+
+        for name in ('moves', 'accepted', 'uphill_tried', 'uphill_accepted', 'reheats', 'reheats_since_best',
+                     'restarts', 'temperature', 'start_temperature', 'best_cost'):
+            setattr(self, name, metadata[name])
+
+        self.elapsed = metadata['run_time']
+        self.best_assignment = arrays['best_assignment']
+        self.pool = list(zip(metadata['pool_costs'], arrays['pool']))
+        set_random_state(self.random, metadata['random_state'])
+
+    def run(self, time_limit=None, max_moves=None, checkpoint_path=None, checkpoint_interval=60, log_path=None,
+            log_interval=10, callback=None):
+        start_timestamp = datetime.now()
+        last_checkpoint = last_log = self.elapsed
+        log_file = open(log_path, 'a') if log_path is not None else None
+
+        try:
+            while max_moves is None or self.moves < max_moves:
+                for _ in range(self.adapt_interval):
+                    self.step()
+                    self.temperature *= self.cooling
+
+                self.adapt()
+                run_time = self.elapsed + (datetime.now() - start_timestamp).total_seconds()
+                done = (time_limit is not None and run_time >= time_limit) or \
+                    (max_moves is not None and self.moves >= max_moves)
+
+                if run_time - last_log >= log_interval or done:
+                    last_log = run_time
+                    record = {'run_time': run_time, 'moves': self.moves, 'moves_per_second': self.moves / run_time,
+                              'acceptance_rate': self.accepted / self.moves, 'temperature': self.temperature,
+                              'cost': self.evaluator.total_cost, 'best_cost': self.best_cost,
+                              'reheats': self.reheats, 'restarts': self.restarts}
+
+                    if log_file is not None:
+                        log_file.write(json.dumps(record) + '\n')
+                        log_file.flush()
+                    if callback is not None:
+                        callback(record)
+
+                if checkpoint_path is not None and (run_time - last_checkpoint >= checkpoint_interval or done):
+                    last_checkpoint = run_time
+                    self.checkpoint(checkpoint_path, run_time)
+
+                if done:
+                    break
+        finally:
+            self.elapsed = (datetime.now() - start_timestamp).total_seconds() + self.elapsed
+
+            if log_file is not None:
+                log_file.close()
+
+        self.evaluator.resync()
+
+        return self.best_cost
+
+
+# Run annealing as a parallel search engine -----------------------
+def annealing_search(local_search, rng, kick_size, time_limit=None):
+    # One short anneal per round, ending on the best schedule it visited. Returns moves tried.
+    annealing = SimulatedAnnealing(local_search, seed=int(rng.integers(2 ** 32)))
+    annealing.run(time_limit=time_limit, max_moves=kick_size * 20000)
+    local_search.reset(annealing.best_assignment)
+
+    return annealing.moves
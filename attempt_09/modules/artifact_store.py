@@ -0,0 +1,91 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import hashlib
+import json
+import os
+
+from tour_data import FamilyData, read_family_data, build_accounting_table, accounting_options
+
+STORE_ROOT = 'attempt_09/artifacts/store'
+STORE_VERSION = 1
+
+
+# Define artifact store keyed by input data and parameters --------
+def artifact_key(csv_path, params):
+    key = hashlib.sha256()
+
+    with open(csv_path, 'rb') as f:
+        key.update(f.read())
+
+    key.update(json.dumps({'version': STORE_VERSION, 'params': params}, sort_keys=True).encode())
+
+    return key.hexdigest()[:16]
+
+
+class ArtifactStore:
+    def __init__(self, csv_path, root=STORE_ROOT, **params):
+        self.csv_path = csv_path
+        self.params = params
+        self.key = artifact_key(csv_path, params)
+        self.path = os.path.join(root, self.key)
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.path, 'manifest.json')
+
+        if not os.path.exists(manifest_path):
+            with open(manifest_path, 'w') as f:
+                json.dump({'csv_path': self.csv_path, 'params': self.params, 'version': STORE_VERSION}, f,
+                          indent=2, sort_keys=True)
+
+    def load(self, name, build):
+        array_path = os.path.join(self.path, '%s.npy' % name)
+
+        if not os.path.exists(array_path):
+            os.makedirs(self.path, exist_ok=True)
+            self._write_manifest()
+
+            # Write to a temporary file first so parallel workers never read a partial array
+            tmp_path = '%s.%d.tmp' % (array_path, os.getpid())
+
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(build()))
+
+            os.replace(tmp_path, array_path)
+
+        return np.load(array_path, mmap_mode='r')
+
+
+# Load derived tour arrays ----------------------------------------
+def load_family_data(csv_path, root=STORE_ROOT):
+    store = ArtifactStore(csv_path, root=root)
+    family_data = []
+
+    def build(field):
+        nonlocal family_data
+
+        if not family_data:
+            family_data = read_family_data(csv_path)
+
+        return getattr(family_data, field)
+
+    return FamilyData(*[store.load(field, lambda: build(field)) for field in FamilyData._fields])
+
+
+def load_accounting_table(csv_path, root=STORE_ROOT):
+    return ArtifactStore(csv_path, root=root).load('accounting_table', build_accounting_table)
+
+
+def load_accounting_options(csv_path, accounting_cutoff=None, root=STORE_ROOT):
+    store = ArtifactStore(csv_path, root=root, accounting_cutoff=accounting_cutoff)
+    table = load_accounting_table(csv_path, root=root)
+    options = []
+
+    def build(k):
+        nonlocal options
+
+        if not options:
+            options = accounting_options(table, accounting_cutoff)
+
+        return options[k]
+
+    return tuple(store.load(name, lambda: build(k)) for k, name in enumerate(['day', 'day_0', 'day_1']))
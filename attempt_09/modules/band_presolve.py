@@ -0,0 +1,108 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from datetime import datetime
+
+from tour_data import N_DAYS, MIN_OCCUPANCY, MAX_OCCUPANCY
+from scoring import daily_occupancy, score, is_feasible
+from tour_model import build_problem, restrict_accounting_options, start_values, assignment_from_values
+from occupancy_dp import occupancy_band
+from solver_backend import make_backend
+
+
+# Work out each day's attendance band from stored solutions -------
+# Good schedules keep neighbouring days close, so the attendance seen across a few elite schedules, plus a margin,
+# covers most of what the MIP needs. Only accounting pairs inside both days' bands get a column.
+def elite_bands(assignments, family_size, band=10):
+    occupancy = np.array([daily_occupancy(a, family_size) for a in assignments])
+    lower, _ = occupancy_band(occupancy.min(axis=0), band)
+    _, upper = occupancy_band(occupancy.max(axis=0), band)
+
+    return lower, upper
+
+
+def band_accounting_options(accounting_options, accounting_cost, lower, upper, max_pair_cost=None):
+    # A single pair costing more than incumbent - (a lower bound on everything else) can never be in a better schedule
+    day, day_0, day_1 = restrict_accounting_options(accounting_options, lower, upper)
+
+    if max_pair_cost is not None:
+        keep = accounting_cost[day_0 - MIN_OCCUPANCY, day_1 - MIN_OCCUPANCY] <= max_pair_cost
+        day, day_0, day_1 = day[keep], day_0[keep], day_1[keep]
+
+    return day, day_0, day_1
+
+
+def widen_bands(lower, upper, band, days=None):
+    # Widen the given days, or every day, by band people on each side, within the attendance limits
+    lower, upper = lower.copy(), upper.copy()
+    days = np.arange(1, N_DAYS + 1) if days is None else days
+    lower[days] = np.maximum(lower[days] - band, MIN_OCCUPANCY)
+    upper[days] = np.minimum(upper[days] + band, MAX_OCCUPANCY)
+
+    return lower, upper
+
+
+def binding_days(occupancy, lower, upper):
+    # Days sitting on an edge of their band that the attendance limits would still let them cross
+    days = np.arange(1, N_DAYS + 1)
+
+    return days[((occupancy[days] == lower[days]) & (lower[days] > MIN_OCCUPANCY)) |
+                ((occupancy[days] == upper[days]) & (upper[days] < MAX_OCCUPANCY))]
+
+
+# Solve inside the bands, widening them where they bind -----------
+def band_search(assignment, references, family_size, family_choices, preference_cost, accounting_cost,
+                accounting_options, band=10, max_pair_cost=None, solver='gurobi', time_limit=600, max_rounds=5,
+                callback=None):
+    if band < 1:
+        raise ValueError('band must be at least 1 person, not %s' % band)
+
+    assignment = np.array(assignment, dtype=np.int64)
+    cost = sum(score(assignment, preference_cost, family_size)[:2])
+
+    # The incumbent is always one of the references, so its warm start fits inside the bands
+    lower, upper = elite_bands(list(references) + [assignment], family_size, band)
+    start_timestamp = datetime.now()
+    stats = {'round': 0, 'start_cost': cost, 'cost': cost, 'full_accounting': len(accounting_options[0])}
+
+    while stats['round'] < max_rounds:
+        problem = build_problem(family_size, family_choices, preference_cost, accounting_cost,
+                                band_accounting_options(accounting_options, accounting_cost, lower, upper,
+                                                        max_pair_cost))
+        backend = make_backend(solver, problem)
+        backend.set_start(start_values(problem, assignment, family_size))
+        result = backend.solve(time_limit=time_limit)
+
+        stats['round'] += 1
+        stats.update(status=result.status, columns=len(problem.objective), accounting=len(problem.accounting_day),
+                     bound=result.bound, mean_width=float((upper - lower)[1:].mean()) + 1)
+
+        if result.values is None:
+            # No schedule fits the bands, so every day gets more room
+            widened = np.arange(1, N_DAYS + 1)
+        else:
+            solved = assignment_from_values(problem, result.values)
+            preference_penalty, accounting_penalty, occupancy = score(solved, preference_cost, family_size)
+
+            if is_feasible(occupancy) and preference_penalty + accounting_penalty < cost - 1e-6:
+                assignment, cost = solved, preference_penalty + accounting_penalty
+
+            # Days the solution pushes against the edge of their band may want to go further. Once the bound inside
+            # the bands reaches the incumbent, nothing better fits in them, so every day is widened.
+            if result.status == 'optimal' or (result.bound is not None and result.bound >= cost - 1e-6):
+                widened = np.arange(1, N_DAYS + 1)
+            else:
+                widened = binding_days(daily_occupancy(assignment, family_size), lower, upper)
+
+        # Bands already at the attendance limits cannot widen, and re-solving the same model would find nothing new
+        widened_lower, widened_upper = widen_bands(lower, upper, band, widened)
+        widened = widened[(widened_lower[widened] != lower[widened]) | (widened_upper[widened] != upper[widened])]
+        lower, upper = widened_lower, widened_upper
+        stats.update(cost=cost, widened=len(widened), run_time=(datetime.now() - start_timestamp).total_seconds())
+
+        if callback is not None:
+            callback(dict(stats))
+
+        if len(widened) == 0:
+            break
+
+    return assignment, stats
@@ -0,0 +1,142 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import subprocess
+import platform
+import json
+import os
+from datetime import datetime
+
+from tour_data import read_family_data, build_accounting_table, accounting_options
+from tour_model import build_problem
+from scoring import DeltaEvaluator, score
+from local_search import LocalSearch
+from annealing import SimulatedAnnealing
+from solution_io import read_assignment
+
+
+# Time each stage of the pipeline ---------------------------------
+def best_time(function, repeats=5):
+    # The fastest of a few runs is the least noisy estimate of a short stage
+    timings = []
+
+    for _ in range(repeats):
+        start_timestamp = datetime.now()
+        result = function()
+        timings.append((datetime.now() - start_timestamp).total_seconds())
+
+    return min(timings), result
+
+
+def time_to_target(run, target):
+    # Seconds until a heuristic's progress callback first reports a cost at or below the target
+    reached = []
+
+    def callback(stats):
+        if not reached and stats['cost'] <= target:
+            reached.append(stats['run_time'])
+
+    run(callback)
+
+    return reached[0] if reached else None
+
+
+def run_benchmarks(csv_path, solution_path, start_path, moves=200000, local_search_target=73500,
+                   annealing_target=74000, annealing_time_limit=60, seed=2019):
+    metrics = {}
+
+    def record(name, value, unit, better):
+        metrics[name] = {'value': value, 'unit': unit, 'better': better}
+
+    seconds, (family_size, family_choices, preference_cost) = best_time(lambda: read_family_data(csv_path))
+    record('read_family_data', seconds, 's', 'lower')
+
+    seconds, accounting = best_time(build_accounting_table)
+    record('build_accounting_table', seconds, 's', 'lower')
+
+    options = accounting_options(accounting, 300)
+    seconds, problem = best_time(lambda: build_problem(family_size, family_choices, preference_cost, accounting,
+                                                       options), repeats=1)
+    record('build_problem', seconds, 's', 'lower')
+    record('build_problem_columns', len(problem.objective), 'columns', 'lower')
+    del problem
+
+    assignment = read_assignment(solution_path)
+    seconds, _ = best_time(lambda: score(assignment, preference_cost, family_size), repeats=100)
+    record('score', seconds, 's', 'lower')
+
+    # Random single-family moves to one of the top 10 choices, from a fixed seed
+    rng = np.random.default_rng(seed)
+    families = rng.integers(len(family_size), size=moves).tolist()
+    days = family_choices[families, rng.integers(family_choices.shape[1], size=moves)].tolist()
+    evaluator = DeltaEvaluator(assignment, preference_cost, family_size, accounting)
+
+    def evaluate_moves():
+        for family, day in zip(families, days):
+            evaluator.move_delta(family, day)
+
+    seconds, _ = best_time(evaluate_moves, repeats=1)
+    record('move_delta_throughput', moves / seconds, 'moves/s', 'higher')
+
+    start = read_assignment(start_path)
+    local_search = LocalSearch(DeltaEvaluator(start, preference_cost, family_size, accounting), family_choices,
+                               seed=seed)
+    record('local_search_time_to_target',
+           time_to_target(lambda callback: local_search.run(callback=callback), local_search_target), 's', 'lower')
+
+    annealing = SimulatedAnnealing(LocalSearch(DeltaEvaluator(start, preference_cost, family_size, accounting),
+                                               family_choices), seed=seed)
+    record('annealing_time_to_target',
+           time_to_target(lambda callback: annealing.run(time_limit=annealing_time_limit, log_interval=0,
+                                                         callback=lambda r: callback(dict(r, cost=r['best_cost']))),
+                          annealing_target), 's', 'lower')
+
+    return {'timestamp': datetime.now().isoformat(), 'commit': git_commit(), 'machine': machine(),
+            'parameters': {'csv_path': csv_path, 'solution_path': solution_path, 'start_path': start_path,
+                           'moves': moves, 'local_search_target': local_search_target,
+                           'annealing_target': annealing_target, 'seed': seed},
+            'metrics': metrics}
+
+
+# Describe where the benchmark ran --------------------------------
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL).decode() \
+            .strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine():
+    return {'platform': platform.platform(), 'processor': platform.processor(), 'cpu_count': os.cpu_count(),
+            'python': platform.python_version(), 'numpy': np.__version__}
+
+
+# Compare against a stored baseline -------------------------------
+def find_regressions(results, baseline, tolerance=0.25):
+    # A metric regresses when it is worse than the baseline by more than the tolerance, or stops reaching its target
+    regressions = []
+
+    for name, metric in results['metrics'].items():
+        if name not in baseline['metrics'] or baseline['metrics'][name]['value'] is None:
+            continue
+
+        value, reference = metric['value'], baseline['metrics'][name]['value']
+
+        if value is None:
+            regressions.append((name, reference, value))
+        elif metric['better'] == 'lower' and value > reference * (1 + tolerance):
+            regressions.append((name, reference, value))
+        elif metric['better'] == 'higher' and value < reference * (1 - tolerance):
+            regressions.append((name, reference, value))
+
+    return regressions
+
+
+def write_results(path, results):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def read_results(path):
+    with open(path) as f:
+        return json.load(f)
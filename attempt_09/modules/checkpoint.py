@@ -0,0 +1,60 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import json
+import os
+
+
+# Save and load search state atomically ---------------------------
+# One .npz per job holds the arrays, plus a JSON string with the counters, parameters and RNG states. It is written to
+# a temporary file, synced and renamed, so a crash mid-write leaves the previous checkpoint in place.
+def save_checkpoint(path, metadata, **arrays):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    with open(path + '.tmp', 'wb') as f:
+        np.savez(f, metadata=np.array(json.dumps(metadata)), **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(path + '.tmp', path)
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        raise ValueError('No checkpoint to resume from at %s' % path)
+
+    with np.load(path) as data:
+        return json.loads(str(data['metadata'])), {name: data[name] for name in data.files if name != 'metadata'}
+
+
+def random_state(generator):
+    # Python's random state is a tuple of ints, NumPy's a dict, and JSON keeps both once the tuples become lists
+    if isinstance(generator, np.random.Generator):
+        return generator.bit_generator.state
+
+    version, internal, gauss = generator.getstate()
+
+    return [version, list(internal), gauss]
+
+
+def set_random_state(generator, state):
+    if isinstance(generator, np.random.Generator):
+        generator.bit_generator.state = state
+    else:
+        generator.setstate((state[0], tuple(state[1]), state[2]))
+
+
+class Checkpointer:
+    def __init__(self, path, interval=60):
+        self.path = path
+        self.interval = interval
+        self.last_save = -np.inf
+
+    def due(self, run_time):
+        return run_time - self.last_save >= self.interval
+
+    def save(self, run_time, metadata, **arrays):
+        self.last_save = run_time
+        save_checkpoint(self.path, dict(metadata, run_time=run_time), **arrays)
+
+    def load(self):
+        return load_checkpoint(self.path)
@@ -0,0 +1,86 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from datetime import datetime
+
+from tour_data import N_DAYS, ATTENDANCE_RANGE, build_accounting_table
+from scoring import daily_occupancy, score
+from occupancy_dp import occupancy_band, occupancy_profile
+from preference_flow import repair_assignment
+
+
+# Evaluate the Lagrangian dual ------------------------------------
+# Dualizing Set_Attendance_d with a multiplier per day charges each family lambda_d per person for the day it picks,
+# and credits the occupancy chain lambda_d per person attending, so the two halves are solved separately.
+def lagrangian_bound(multipliers, family_size, preference_cost, accounting=None):
+    family_size = np.asarray(family_size, dtype=np.int64)
+    family_cost = np.asarray(preference_cost)[:, 1:] + multipliers[None, 1:] * family_size[:, None]
+    assignment = family_cost.argmin(axis=1) + 1
+    family_bound = family_cost[np.arange(len(family_size)), assignment - 1].sum()
+
+    lower, upper = occupancy_band(np.zeros(N_DAYS + 1), np.inf)
+    day_price = -multipliers[:, None] * ATTENDANCE_RANGE[None, :]
+    profile, chain_bound = occupancy_profile(lower, upper, accounting, day_price=day_price)
+
+    return float(family_bound + chain_bound), assignment, profile
+
+
+# Run subgradient steps on the multipliers ------------------------
+def lagrangian_search(family_size, family_choices, preference_cost, accounting=None, multipliers=None,
+                      upper_bound=None, max_iterations=200, step_scale=2.0, patience=10, repair_band=4,
+                      time_limit=None, callback=None):
+    family_size = np.asarray(family_size, dtype=np.int64)
+    accounting = build_accounting_table() if accounting is None else accounting
+    multipliers = np.zeros(N_DAYS + 1) if multipliers is None else np.array(multipliers, dtype=np.float64)
+
+    start_timestamp = datetime.now()
+    best_assignment = None
+    stats = {'iteration': 0, 'best_bound': -np.inf, 'best_cost': np.inf, 'step_scale': step_scale}
+    stalled = 0
+
+    while stats['iteration'] < max_iterations:
+        bound, assignment, profile = lagrangian_bound(multipliers, family_size, preference_cost, accounting)
+
+        # Repair the family half of the relaxed solution towards the occupancy half, within repair_band people
+        try:
+            lower, upper = occupancy_band(profile, repair_band)
+            primal = repair_assignment(assignment, family_size, preference_cost, family_choices, lower=lower,
+                                       upper=upper)
+        except ValueError:
+            primal = repair_assignment(assignment, family_size, preference_cost, family_choices)
+
+        primal_cost = sum(score(primal, preference_cost, family_size)[:2])
+
+        if primal_cost < stats['best_cost']:
+            best_assignment = primal
+            stats['best_cost'] = primal_cost
+
+        if bound > stats['best_bound'] + 1e-6:
+            stats['best_bound'] = bound
+            stats['best_multipliers'] = multipliers.copy()
+            stalled = 0
+        else:
+            stalled += 1
+
+        # Halve the Polyak step when the bound has not improved for a while
+        if stalled >= patience:
+            stats['step_scale'] /= 2
+            stalled = 0
+
+        subgradient = daily_occupancy(assignment, family_size) - profile
+        subgradient[0] = 0
+        target = stats['best_cost'] if upper_bound is None else upper_bound
+        step = stats['step_scale'] * max(target - bound, 0.0) / max(float(subgradient @ subgradient), 1.0)
+        multipliers = multipliers + step * subgradient
+
+        run_time = (datetime.now() - start_timestamp).total_seconds()
+        stats['iteration'] += 1
+        stats.update({'bound': bound, 'cost': primal_cost, 'step': step, 'run_time': run_time,
+                      'violation': int(np.abs(subgradient).sum())})
+
+        if callback is not None:
+            callback(dict(stats))
+
+        if np.abs(subgradient).sum() == 0 or (time_limit is not None and run_time >= time_limit):
+            break
+
+    return best_assignment, stats
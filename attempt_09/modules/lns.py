@@ -0,0 +1,152 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import multiprocessing as mp
+from datetime import datetime
+
+from tour_data import N_DAYS
+from scoring import score, is_feasible
+from tour_model import build_subset_problem, build_window_problem, start_values, extract_assignment
+from solver_backend import make_backend
+from parallel_search import SharedArrays, attach_shared_arrays
+from checkpoint import Checkpointer, random_state, set_random_state
+
+DESTROY_OPERATORS = ('window', 'random')
+
+_blocks = {}
+_arrays = {}
+
+
+# Choose which families to free -----------------------------------
+def destroy(operator, assignment, rng, window=3, subset_size=25):
+    if operator == 'window':
+        first_day = int(rng.integers(1, N_DAYS - window + 2))
+
+        return {'operator': operator, 'window_days': np.arange(first_day, first_day + window)}
+    elif operator == 'random':
+        return {'operator': operator, 'free_families': np.sort(rng.choice(len(assignment), subset_size,
+                                                                          replace=False))}
+    else:
+        raise ValueError('Unknown destroy operator: %s' % operator)
+
+
+# Repair a neighbourhood with a sub-MIP ---------------------------
+def repair(neighbourhood, assignment, arrays, solver='highs', time_limit=30):
+    accounting_options = (arrays['accounting_day'], arrays['accounting_day_0'], arrays['accounting_day_1'])
+
+    if neighbourhood['operator'] == 'window':
+        problem, fixed_cost = build_window_problem(assignment, neighbourhood['window_days'], arrays['family_members'],
+                                                   arrays['family_choices'], arrays['preference_cost'],
+                                                   arrays['accounting_table'], accounting_options)
+    else:
+        problem, fixed_cost = build_subset_problem(assignment, neighbourhood['free_families'], arrays['family_members'],
+                                                   arrays['family_choices'], arrays['preference_cost'],
+                                                   arrays['accounting_table'], accounting_options)
+
+    backend = make_backend(solver, problem)
+    backend.set_start(start_values(problem, assignment, arrays['family_members']))
+    result = backend.solve(time_limit=time_limit)
+
+    if result.values is None:
+        return None, np.inf, result
+
+    return extract_assignment(problem, result.values, assignment), result.objective + fixed_cost, result
+
+
+def _init_worker(descriptors):
+    # Pool workers attach to the shared cost arrays once, rather than receiving them with every task
+    global _blocks, _arrays
+    _blocks, _arrays = attach_shared_arrays(descriptors)
+
+
+def _repair_task(task, arrays=None):
+    neighbourhood, assignment, solver, time_limit = task
+    repaired, cost, result = repair(neighbourhood, assignment, _arrays if arrays is None else arrays, solver,
+                                    time_limit)
+
+    return neighbourhood, repaired, cost, result.status, result.run_time
+
+
+# Run destroy and repair rounds on a global incumbent -------------
+def lns_search(assignment, family_members, family_choices, preference_cost, accounting, accounting_options,
+               solver='highs', operators=DESTROY_OPERATORS, window=3, subset_size=25, sub_time_limit=30,
+               time_limit=600, max_rounds=None, n_workers=1, seed=None, callback=None, checkpoint_path=None,
+               checkpoint_interval=60, resume=False):
+    if resume and checkpoint_path is None:
+        raise ValueError('resume=True needs a checkpoint_path to load from')
+
+    rng = np.random.default_rng(seed)
+    assignment = np.array(assignment, dtype=np.int64)
+    cost = sum(score(assignment, preference_cost, family_members)[:2])
+    stats = {'round': 0, 'solved': 0, 'improved': 0, 'start_cost': cost}
+    elapsed = 0.0
+    checkpointer = Checkpointer(checkpoint_path, checkpoint_interval) if checkpoint_path is not None else None
+
+    # A resumed search picks up the incumbent, counters and random stream where the checkpoint left them
+    if resume:
+        metadata, checkpoint_arrays = checkpointer.load()
+        assignment = checkpoint_arrays['assignment']
+        cost = sum(score(assignment, preference_cost, family_members)[:2])
+        stats = metadata['stats']
+        elapsed = checkpointer.last_save = metadata['run_time']
+        set_random_state(rng, metadata['random_state'])
+
+    arrays = {'preference_cost': preference_cost, 'family_members': np.asarray(family_members, dtype=np.int64),
+              'family_choices': family_choices, 'accounting_table': accounting}
+
+    for name, option in zip(('accounting_day', 'accounting_day_0', 'accounting_day_1'), accounting_options):
+        arrays[name] = option
+
+    shared_arrays = SharedArrays(arrays) if n_workers > 1 else None
+    pool = mp.Pool(n_workers, initializer=_init_worker, initargs=(shared_arrays.descriptors,)) \
+        if n_workers > 1 else None
+
+    start_timestamp = datetime.now()
+
+    try:
+        while max_rounds is None or stats['round'] < max_rounds:
+            # Each worker repairs its own neighbourhood of the same incumbent
+            round_start = assignment
+            tasks = [(destroy(operators[rng.integers(len(operators))], round_start, rng, window, subset_size),
+                      round_start, solver, sub_time_limit) for _ in range(n_workers)]
+            results = pool.map(_repair_task, tasks) if pool is not None else [_repair_task(t, arrays) for t in tasks]
+
+            # Fold improvements into the incumbent one at a time, keeping each only if the full score agrees
+            for _, repaired, repaired_cost, _, _ in sorted(results, key=lambda r: r[2]):
+                stats['solved'] += 1
+
+                if repaired is None or repaired_cost >= cost - 1e-6:
+                    continue
+
+                trial = assignment.copy()
+                moved = np.nonzero(repaired != round_start)[0]
+                trial[moved] = repaired[moved]
+                preference_penalty, accounting_penalty, occupancy = score(trial, preference_cost, family_members)
+
+                if is_feasible(occupancy) and preference_penalty + accounting_penalty < cost - 1e-6:
+                    assignment = trial
+                    cost = preference_penalty + accounting_penalty
+                    stats['improved'] += 1
+
+            stats['round'] += 1
+            stats['cost'] = cost
+            stats['run_time'] = elapsed + (datetime.now() - start_timestamp).total_seconds()
+
+            if callback is not None:
+                callback(dict(stats))
+
+            done = (time_limit is not None and stats['run_time'] >= time_limit) or \
+                (max_rounds is not None and stats['round'] >= max_rounds)
+
+            if checkpointer is not None and (checkpointer.due(stats['run_time']) or done):
+                checkpointer.save(stats['run_time'], {'stats': stats, 'random_state': random_state(rng)},
+                                  assignment=assignment)
+
+            if done:
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+            shared_arrays.close()
+
+    return assignment, stats
@@ -0,0 +1,158 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from datetime import datetime, timedelta
+
+from tour_data import N_DAYS
+
+NEIGHBOURHOODS = ('choice_move', 'swap', 'move')
+DEADLINE_INTERVAL = 100  # families between clock checks inside a sweep
+
+
+# Define local search over the occupancy array --------------------
+class LocalSearch:
+    def __init__(self, evaluator, family_choices, top_k=None, seed=None):
+        family_choices = np.asarray(family_choices)
+
+        if top_k is not None:
+            family_choices = family_choices[:, :top_k]
+
+        self.evaluator = evaluator
+        self.family_choices = family_choices.tolist()
+        self.choice_sets = [set(c) for c in self.family_choices]
+        self.rng = np.random.default_rng(seed)
+        self.all_days = list(range(1, N_DAYS + 1))
+        self.day_members = [set() for _ in range(N_DAYS + 1)]
+        self.evaluated = 0
+        self.accepted = 0
+
+        for f, d in enumerate(evaluator.assignment.tolist()):
+            self.day_members[d].add(f)
+
+    def reset(self, assignment):
+        self.evaluator.reset(assignment)
+        self.day_members = [set() for _ in range(N_DAYS + 1)]
+
+        for f, d in enumerate(self.evaluator.assignment.tolist()):
+            self.day_members[d].add(f)
+
+    def apply_move(self, family, day):
+        self.day_members[int(self.evaluator.assignment[family])].discard(family)
+        self.day_members[day].add(family)
+        self.accepted += 1
+
+        return self.evaluator.move(family, day)
+
+    def apply_swap(self, family_a, family_b):
+        day_a = int(self.evaluator.assignment[family_a])
+        day_b = int(self.evaluator.assignment[family_b])
+        self.day_members[day_a].discard(family_a)
+        self.day_members[day_b].discard(family_b)
+        self.day_members[day_b].add(family_a)
+        self.day_members[day_a].add(family_b)
+        self.accepted += 1
+
+        return self.evaluator.swap(family_a, family_b)
+
+    def move_sweep(self, choice_restricted=True, deadline=None):
+        evaluator = self.evaluator
+        saved = 0.0
+
+        for i, family in enumerate(self.rng.permutation(len(self.family_choices)).tolist()):
+            if deadline is not None and i % DEADLINE_INTERVAL == 0 and datetime.now() >= deadline:
+                break
+
+            best_day = None
+            best_delta = -1e-9
+
+            for day in (self.family_choices[family] if choice_restricted else self.all_days):
+                if not evaluator.is_feasible_move(family, day):
+                    continue
+
+                self.evaluated += 1
+                delta = evaluator.move_delta(family, day)
+
+                if delta < best_delta:
+                    best_day = day
+                    best_delta = delta
+
+            if best_day is not None:
+                saved -= self.apply_move(family, best_day)
+
+        return saved
+
+    def swap_sweep(self, deadline=None):
+        evaluator = self.evaluator
+        saved = 0.0
+
+        for i, family_a in enumerate(self.rng.permutation(len(self.family_choices)).tolist()):
+            if deadline is not None and i % DEADLINE_INTERVAL == 0 and datetime.now() >= deadline:
+                break
+
+            day_a = int(evaluator.assignment[family_a])
+
+            for day_b in self.family_choices[family_a]:
+                if day_b == day_a:
+                    continue
+
+                best_family = None
+                best_delta = -1e-9
+
+                for family_b in self.day_members[day_b]:
+                    if day_a not in self.choice_sets[family_b] or not evaluator.is_feasible_swap(family_a, family_b):
+                        continue
+
+                    self.evaluated += 1
+                    delta = evaluator.swap_delta(family_a, family_b)
+
+                    if delta < best_delta:
+                        best_family = family_b
+                        best_delta = delta
+
+                if best_family is not None:
+                    saved -= self.apply_swap(family_a, best_family)
+                    break
+
+        return saved
+
+    def sweep(self, neighbourhood, deadline=None):
+        # Sweeps stop early at the deadline, so a time limit holds to within one batch of families
+        if neighbourhood == 'choice_move':
+            return self.move_sweep(choice_restricted=True, deadline=deadline)
+        elif neighbourhood == 'move':
+            return self.move_sweep(choice_restricted=False, deadline=deadline)
+        elif neighbourhood == 'swap':
+            return self.swap_sweep(deadline=deadline)
+        else:
+            raise ValueError('Unknown neighbourhood: %s' % neighbourhood)
+
+    def run(self, neighbourhoods=NEIGHBOURHOODS, max_sweeps=None, time_limit=None, callback=None):
+        start_timestamp = datetime.now()
+        deadline = start_timestamp + timedelta(seconds=time_limit) if time_limit is not None else None
+        sweep_counter = 0
+        timed_out = False
+
+        while max_sweeps is None or sweep_counter < max_sweeps:
+            sweep_counter += 1
+            saved = 0.0
+
+            for neighbourhood in neighbourhoods:
+                neighbourhood_saved = self.sweep(neighbourhood, deadline)
+                saved += neighbourhood_saved
+                run_time = (datetime.now() - start_timestamp).total_seconds()
+
+                if callback is not None:
+                    callback({'sweep': sweep_counter, 'neighbourhood': neighbourhood, 'saved': neighbourhood_saved,
+                              'cost': self.evaluator.total_cost, 'evaluated': self.evaluated,
+                              'accepted': self.accepted, 'run_time': run_time})
+
+                timed_out = time_limit is not None and run_time >= time_limit
+
+                if timed_out:
+                    break
+
+            if saved <= 1e-6 or timed_out:
+                break
+
+        self.evaluator.resync()
+
+        return self.evaluator.total_cost
@@ -0,0 +1,110 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from datetime import datetime
+
+from tour_data import N_DAYS
+from scoring import score, is_feasible
+from tour_model import start_values, assignment_from_values
+from preference_flow import repair_assignment
+from swap_search import swap_search
+
+
+# Polish solver incumbents and node relaxations -------------------
+# The solver backend calls on_incumbent with every new incumbent and on_relaxation with node LP values. Both return
+# full start vectors for schedules the swap search improved, which the backend hands back to the running MIP. With
+# polish off, incumbents are only checkpointed.
+class IncumbentPolisher:
+    def __init__(self, problem, family_size, family_choices, preference_cost, accounting, top_k=5, time_limit=10,
+                 node_interval=120, polish=True, checkpointer=None, parameters=None, seed=None, callback=None):
+        self.problem = problem
+        self.family_size = np.asarray(family_size, dtype=np.int64)
+        self.family_choices = family_choices
+        self.preference_cost = preference_cost
+        self.accounting = accounting
+        self.top_k = top_k
+        self.time_limit = time_limit
+        self.node_interval = node_interval
+        self.polish_incumbents = polish
+        self.checkpointer = checkpointer
+        self.parameters = parameters or {}
+        self.seed = seed
+        self.callback = callback
+
+        self.best_cost = np.inf
+        self.best_assignment = None
+        self.last_relaxation = -np.inf
+        self.start_timestamp = datetime.now()
+        self.stats = {'incumbents': 0, 'relaxations': 0, 'improved': 0, 'rejected': 0}
+
+    def model_values(self, assignment):
+        # Accounting columns only exist for the (today, tomorrow) pairs kept in the model, so check the start uses them
+        values = start_values(self.problem, assignment, self.family_size)
+        n_visit = len(self.problem.visit_family)
+
+        if values[:n_visit].sum() != len(assignment) or values[n_visit + N_DAYS:].sum() != N_DAYS:
+            self.stats['rejected'] += 1
+            return None
+
+        return values
+
+    def save(self, assignment, cost, source):
+        # Incumbents are checkpointed with the solver parameters, so a resumed run starts from them with the same setup
+        if self.checkpointer is not None:
+            self.checkpointer.save((datetime.now() - self.start_timestamp).total_seconds(),
+                                   {'cost': cost, 'source': source, 'parameters': self.parameters,
+                                    'stats': self.stats}, assignment=assignment)
+
+    def polish(self, assignment, source):
+        assignment, _ = swap_search(assignment, self.family_size, self.preference_cost, self.family_choices,
+                                    self.accounting, top_k=self.top_k, time_limit=self.time_limit, seed=self.seed)
+        preference_penalty, accounting_penalty, occupancy = score(assignment, self.preference_cost, self.family_size)
+        cost = preference_penalty + accounting_penalty
+
+        if not is_feasible(occupancy) or cost >= self.best_cost - 1e-6:
+            return None
+
+        values = self.model_values(assignment)
+
+        if values is None:
+            return None
+
+        self.best_cost = cost
+        self.best_assignment = assignment
+        self.stats['improved'] += 1
+        self.save(assignment, cost, source)
+
+        if self.callback is not None:
+            self.callback(dict(self.stats, source=source, cost=cost,
+                               run_time=(datetime.now() - self.start_timestamp).total_seconds()))
+
+        return values, cost
+
+    def on_incumbent(self, values, objective):
+        # Our own injected schedules come back as incumbents too, and need no second pass
+        if objective >= self.best_cost - 1e-6:
+            return None
+
+        assignment = assignment_from_values(self.problem, values)
+        self.best_cost = objective
+        self.best_assignment = assignment
+        self.stats['incumbents'] += 1
+        self.save(assignment, objective, 'solver')
+
+        return self.polish(assignment, 'incumbent') if self.polish_incumbents else None
+
+    def wants_relaxation(self, run_time):
+        # Reading 1.4 million node values is not free, so relaxations are rounded at most once per interval
+        return self.polish_incumbents and run_time - self.last_relaxation >= self.node_interval
+
+    def on_relaxation(self, values, run_time):
+        self.last_relaxation = run_time
+        self.stats['relaxations'] += 1
+
+        # Round each family to its largest visit value, then move families until every day is within the limits
+        try:
+            assignment = repair_assignment(assignment_from_values(self.problem, values), self.family_size,
+                                           self.preference_cost, self.family_choices)
+        except ValueError:
+            return None
+
+        return self.polish(assignment, 'relaxation')
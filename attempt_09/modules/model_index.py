@@ -0,0 +1,63 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from collections import namedtuple
+
+from tour_data import N_DAYS, MIN_OCCUPANCY, ATTENDANCE_RANGE
+
+ModelIndex = namedtuple('ModelIndex', ['visit_by_family', 'visit_by_day', 'accounting_by_day',
+                                       'accounting_by_day_0', 'accounting_by_day_1'])
+
+
+# Group column positions by key in CSR layout ---------------------
+class GroupIndex:
+    def __init__(self, keys, n_groups):
+        keys = np.asarray(keys, dtype=np.int64)
+        self.order = np.argsort(keys, kind='stable')
+        self.offsets = np.zeros(n_groups + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum(np.bincount(keys, minlength=n_groups))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, group):
+        return self.order[self.offsets[group]:self.offsets[group + 1]]
+
+    def counts(self):
+        return np.diff(self.offsets)
+
+    def groups(self, start=0, stop=None):
+        # Group number and column position of every entry in groups start..stop - 1
+        stop = len(self) if stop is None else stop
+        group = np.repeat(np.arange(start, stop), np.diff(self.offsets[start:stop + 1]))
+
+        return group, self.order[self.offsets[start]:self.offsets[stop]]
+
+    def argmax(self, values):
+        # Column position of the largest value in each group, or -1 for empty groups, without a loop over groups
+        values = np.asarray(values)[self.order]
+        counts = self.counts()
+        starts = self.offsets[:-1][counts > 0]
+        group_max = np.maximum.reduceat(values, starts)
+        position = np.where(values == np.repeat(group_max, counts[counts > 0]), np.arange(len(values)), len(values))
+
+        columns = np.full(len(self), -1, dtype=np.int64)
+        columns[counts > 0] = self.order[np.minimum.reduceat(position, starts)]
+
+        return columns
+
+
+# Build the grouping index of the tour model once -----------------
+def attendance_key(day, visitors):
+    return (np.asarray(day, dtype=np.int64) - 1) * len(ATTENDANCE_RANGE) + \
+        np.asarray(visitors, dtype=np.int64) - MIN_OCCUPANCY
+
+
+def build_model_index(visit_family, visit_day, accounting_day, accounting_day_0, accounting_day_1):
+    n_families = int(visit_family.max()) + 1 if len(visit_family) else 0
+    n_pairs = N_DAYS * len(ATTENDANCE_RANGE)
+
+    return ModelIndex(GroupIndex(visit_family, n_families),
+                      GroupIndex(visit_day - 1, N_DAYS),
+                      GroupIndex(accounting_day - 1, N_DAYS),
+                      GroupIndex(attendance_key(accounting_day, accounting_day_0), n_pairs),
+                      GroupIndex(attendance_key(accounting_day, accounting_day_1), n_pairs))
@@ -0,0 +1,122 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+
+from tour_data import N_DAYS, MIN_OCCUPANCY, MAX_OCCUPANCY, ATTENDANCE_RANGE, build_accounting_table
+from scoring import accounting_penalties
+from preference_flow import preference_flow, round_flow, repair_assignment
+
+
+# Define occupancy bands ------------------------------------------
+def occupancy_band(target, band):
+    # Allowed attendance of each day, indexed by day, within band people of the target profile
+    target = np.asarray(target, dtype=np.int64)
+    lower = np.clip(target - band, MIN_OCCUPANCY, MAX_OCCUPANCY)
+    upper = np.clip(target + band, MIN_OCCUPANCY, MAX_OCCUPANCY)
+    lower[0] = upper[0] = 0
+
+    return lower, upper
+
+
+# Find the cheapest occupancy profile by dynamic programming ------
+# The state on day d is its attendance N_d. Walking back from day 100, the cost to go from N_d is the accounting
+# term for (N_d, N_d+1) plus the cost to go from N_d+1, so the whole table is one broadcast per day.
+def occupancy_profile(lower, upper, accounting=None, people_price=0.0, day_price=None):
+    accounting = build_accounting_table() if accounting is None else np.asarray(accounting)
+    n_range = len(ATTENDANCE_RANGE)
+    allowed = (ATTENDANCE_RANGE[None, :] >= np.asarray(lower)[:, None]) & \
+        (ATTENDANCE_RANGE[None, :] <= np.asarray(upper)[:, None])
+
+    # Prices let callers charge each person (or each attendance on a given day), as in a Lagrangian relaxation
+    price = np.broadcast_to(people_price * ATTENDANCE_RANGE, (N_DAYS + 1, n_range)).astype(np.float64)
+
+    if day_price is not None:
+        price = price + day_price
+
+    best_next = np.zeros((N_DAYS + 1, n_range), dtype=np.int64)
+    cost_to_go = np.where(allowed[N_DAYS], np.diagonal(accounting) + price[N_DAYS], np.inf)
+
+    for d in range(N_DAYS - 1, 0, -1):
+        total = accounting + cost_to_go[None, :]
+        best_next[d] = total.argmin(axis=1)
+        cost_to_go = np.where(allowed[d], total[np.arange(n_range), best_next[d]] + price[d], np.inf)
+
+    if not np.isfinite(cost_to_go).any():
+        raise ValueError('No occupancy profile fits within the bands')
+
+    profile = np.zeros(N_DAYS + 1, dtype=np.int64)
+    state = int(cost_to_go.argmin())
+
+    for d in range(1, N_DAYS + 1):
+        profile[d] = ATTENDANCE_RANGE[state]
+        state = best_next[d, state]
+
+    return profile, float(cost_to_go.min())
+
+
+def cheapest_profile(lower, upper, total_people, accounting=None, day_price=None, iterations=60, max_doublings=40):
+    if not np.sum(lower[1:]) <= total_people <= np.sum(upper[1:]):
+        raise ValueError('Bands seat between %d and %d people, not %d' % (np.sum(lower[1:]), np.sum(upper[1:]),
+                                                                          total_people))
+
+    # Bisect on a price per person until the profile seats everyone, since the DP has no total attendance state
+    price_low, price_high = -1.0, 1.0
+
+    for _ in range(max_doublings):
+        if occupancy_profile(lower, upper, accounting, price_low, day_price)[0].sum() >= total_people:
+            break
+        price_low *= 2
+    else:
+        raise ValueError('No price per person below %g seats %d people' % (price_low, total_people))
+
+    for _ in range(max_doublings):
+        if occupancy_profile(lower, upper, accounting, price_high, day_price)[0].sum() <= total_people:
+            break
+        price_high *= 2
+    else:
+        raise ValueError('No price per person up to %g seats %d people' % (price_high, total_people))
+
+    best_profile = None
+
+    for _ in range(iterations):
+        people_price = (price_low + price_high) / 2
+        profile, _ = occupancy_profile(lower, upper, accounting, people_price, day_price)
+
+        if best_profile is None or abs(profile.sum() - total_people) < abs(best_profile.sum() - total_people):
+            best_profile = profile
+
+        if profile.sum() == total_people:
+            break
+        elif profile.sum() > total_people:
+            price_low = people_price
+        else:
+            price_high = people_price
+
+    # Close any remaining gap one person at a time, on the day where it costs least
+    lower, upper = np.asarray(lower), np.asarray(upper)
+
+    while best_profile.sum() != total_people:
+        step = 1 if best_profile.sum() < total_people else -1
+        candidates = np.tile(best_profile, (N_DAYS, 1))
+        candidates[np.arange(N_DAYS), np.arange(1, N_DAYS + 1)] += step
+        within = (candidates[:, 1:] >= lower[1:]) & (candidates[:, 1:] <= upper[1:])
+        cost = np.array([accounting_penalties(c).sum() for c in candidates])
+        cost[~within.all(axis=1)] = np.inf
+
+        if not np.isfinite(cost).any():
+            raise ValueError('No occupancy profile within the bands seats %d people' % total_people)
+
+        best_profile = candidates[cost.argmin()]
+
+    return best_profile, float(accounting_penalties(best_profile).sum())
+
+
+# Assign families to match an occupancy profile -------------------
+def match_profile(profile, family_size, family_choices, preference_cost, tolerance=10, use_numba=None):
+    # Families are sent through the preference flow with each day held within tolerance people of the profile
+    lower, upper = occupancy_band(profile, tolerance)
+    flow, stats = preference_flow(family_size, family_choices, preference_cost, lower=lower, upper=upper,
+                                  use_numba=use_numba)
+    assignment = repair_assignment(round_flow(flow, family_choices), family_size, preference_cost, family_choices,
+                                   lower=lower, upper=upper)
+
+    return assignment, stats
@@ -0,0 +1,159 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from datetime import datetime
+
+from scoring import DeltaEvaluator
+from local_search import LocalSearch
+from annealing import annealing_search
+
+
+# Share read-only arrays between processes ------------------------
+class SharedArrays:
+    def __init__(self, arrays):
+        self.blocks = {}
+        self.descriptors = {}
+
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks[name] = block
+            self.descriptors[name] = (block.name, array.shape, array.dtype.str)
+
+    def array(self, name):
+        block_name, shape, dtype = self.descriptors[name]
+
+        return np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.blocks[name].buf)
+
+    def close(self):
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+
+def attach_shared_arrays(descriptors):
+    blocks = {}
+    arrays = {}
+
+    for name, (block_name, shape, dtype) in descriptors.items():
+        blocks[name] = shared_memory.SharedMemory(name=block_name)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=blocks[name].buf)
+
+    return blocks, arrays
+
+
+# Define search engines run by each worker ------------------------
+def _kick(local_search, rng, kick_size):
+    evaluator = local_search.evaluator
+    families = rng.choice(len(local_search.family_choices), size=kick_size, replace=False)
+
+    for family in families.tolist():
+        day = local_search.family_choices[family][rng.integers(len(local_search.family_choices[family]))]
+
+        if evaluator.is_feasible_move(family, day):
+            local_search.apply_move(family, day)
+
+
+def iterated_local_search(local_search, rng, kick_size, time_limit=None):
+    # One round of perturbation followed by descent, keeping the result only if it improves. Returns moves evaluated.
+    evaluator = local_search.evaluator
+    start_assignment = evaluator.assignment.copy()
+    start_cost = evaluator.total_cost
+    start_evaluated = local_search.evaluated
+
+    _kick(local_search, rng, kick_size)
+    local_search.run(neighbourhoods=('choice_move', 'swap'), time_limit=time_limit)
+
+    if evaluator.total_cost > start_cost:
+        local_search.reset(start_assignment)
+
+    return local_search.evaluated - start_evaluated
+
+
+ENGINES = {'local_search': iterated_local_search, 'annealing': annealing_search}
+
+
+def _worker(worker_id, descriptors, lock, engine, start_assignment, seed, time_limit, sync_interval, kick_size,
+            results):
+    _, arrays = attach_shared_arrays(descriptors)
+    rng = np.random.default_rng(seed)
+    evaluator = DeltaEvaluator(start_assignment, arrays['preference_cost'], arrays['family_members'],
+                               arrays['accounting_table'])
+    local_search = LocalSearch(evaluator, arrays['family_choices'], seed=seed)
+
+    # The first descent is capped so the chosen engine always gets most of the budget. Every later call gets the
+    # time left, and sweeps check the clock, so workers stop within one batch of moves of the limit.
+    start_timestamp = datetime.now()
+    local_search.run(neighbourhoods=('choice_move', 'swap'), time_limit=min(sync_interval, time_limit / 4))
+    last_sync = start_timestamp
+    evaluated = local_search.evaluated
+    adopted = 0
+    published = 0
+
+    while (datetime.now() - start_timestamp).total_seconds() < time_limit:
+        remaining = time_limit - (datetime.now() - start_timestamp).total_seconds()
+        evaluated += ENGINES[engine](local_search, rng, kick_size, remaining)
+
+        if (datetime.now() - last_sync).total_seconds() >= sync_interval:
+            last_sync = datetime.now()
+
+            # Publish a better local incumbent, otherwise adopt the global one
+            with lock:
+                if evaluator.total_cost < arrays['best_cost'][0] - 1e-6:
+                    arrays['best_assignment'][:] = evaluator.assignment
+                    arrays['best_cost'][0] = evaluator.total_cost
+                    published += 1
+                elif arrays['best_cost'][0] < evaluator.total_cost - 1e-6:
+                    best_assignment = arrays['best_assignment'].copy()
+                    local_search.reset(best_assignment)
+                    adopted += 1
+
+    with lock:
+        if evaluator.total_cost < arrays['best_cost'][0] - 1e-6:
+            arrays['best_assignment'][:] = evaluator.assignment
+            arrays['best_cost'][0] = evaluator.total_cost
+            published += 1
+
+    results.put({'worker': worker_id, 'cost': evaluator.total_cost, 'evaluated': evaluated,
+                 'accepted': local_search.accepted, 'published': published, 'adopted': adopted})
+
+
+# Run independent workers that share the global incumbent ---------
+def parallel_search(warm_starts, preference_cost, family_members, family_choices, accounting, n_workers=None,
+                    engine='local_search', time_limit=600, sync_interval=10, kick_size=10, seed=None):
+    n_workers = n_workers or mp.cpu_count()
+    seeds = np.random.SeedSequence(seed).generate_state(n_workers)
+    start_costs = [DeltaEvaluator(a, preference_cost, family_members, accounting).total_cost for a in warm_starts]
+    best = int(np.argmin(start_costs))
+
+    shared_arrays = SharedArrays({'preference_cost': preference_cost,
+                                  'family_members': np.asarray(family_members, dtype=np.int64),
+                                  'family_choices': family_choices,
+                                  'accounting_table': accounting,
+                                  'best_assignment': np.asarray(warm_starts[best], dtype=np.int64),
+                                  'best_cost': np.array([start_costs[best]])})
+
+    lock = mp.Lock()
+    results = mp.Queue()
+    workers = [mp.Process(target=_worker,
+                          args=(w, shared_arrays.descriptors, lock, engine, warm_starts[w % len(warm_starts)],
+                                int(seeds[w]), time_limit, sync_interval, kick_size, results))
+               for w in range(n_workers)]
+
+    try:
+        for worker in workers:
+            worker.start()
+
+        worker_stats = sorted([results.get() for _ in workers], key=lambda s: s['worker'])
+
+        for worker in workers:
+            worker.join()
+
+        best_assignment = shared_arrays.array('best_assignment').copy()
+        best_cost = float(shared_arrays.array('best_cost')[0])
+    finally:
+        shared_arrays.close()
+
+    return best_assignment, best_cost, worker_stats
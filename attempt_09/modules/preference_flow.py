@@ -0,0 +1,278 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from datetime import datetime
+
+from tour_data import N_DAYS, N_CHOICES, MIN_OCCUPANCY, MAX_OCCUPANCY
+from scoring import daily_occupancy
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# Each person sent to a day below the minimum occupancy earns this credit, so lower bounds are filled first
+LOWER_BOUND_CREDIT = 1e4
+
+
+def occupancy_limits(lower=None, upper=None):
+    # Per-day limits indexed by day, defaulting to the 125-300 attendance limits
+    lower = np.full(N_DAYS + 1, MIN_OCCUPANCY, dtype=np.int64) if lower is None else np.asarray(lower, dtype=np.int64)
+    upper = np.full(N_DAYS + 1, MAX_OCCUPANCY, dtype=np.int64) if upper is None else np.asarray(upper, dtype=np.int64)
+
+    return lower, upper
+
+
+# Define compiled day graph and shortest path kernels -------------
+# Flow is counted in people on family -> day arcs, so a family may be split across its choices. In the residual
+# graph, a family g with people on day d can shift them to another of its choices d2, which gives a day -> day arc
+# costing the change in its per-person preference cost. Only the cheapest such family is kept for each pair.
+@njit(cache=True)
+def _day_graph_numba(flow, choices, unit_cost, weight, via_family, via_from, via_to):
+    weight[:, :] = np.inf
+
+    for g in range(flow.shape[0]):
+        for k in range(flow.shape[1]):
+            if flow[g, k] == 0:
+                continue
+
+            d = choices[g, k]
+
+            for k2 in range(flow.shape[1]):
+                if k2 == k:
+                    continue
+
+                d2 = choices[g, k2]
+                cost = unit_cost[g, k2] - unit_cost[g, k]
+
+                if cost < weight[d, d2]:
+                    weight[d, d2] = cost
+                    via_family[d, d2] = g
+                    via_from[d, d2] = k
+                    via_to[d, d2] = k2
+
+
+@njit(cache=True)
+def _shortest_paths_numba(start_cost, weight, dist, pred):
+    dist[:] = start_cost
+    pred[:] = -1
+
+    # Bellman-Ford over the 100 days, since shifting a family to a cheaper choice gives negative arcs
+    for _ in range(N_DAYS):
+        changed = False
+
+        for d in range(1, N_DAYS + 1):
+            if dist[d] == np.inf:
+                continue
+
+            for d2 in range(1, N_DAYS + 1):
+                if dist[d] + weight[d, d2] < dist[d2] - 1e-9:
+                    dist[d2] = dist[d] + weight[d, d2]
+                    pred[d2] = d
+                    changed = True
+
+        if not changed:
+            break
+
+
+def _day_graph_numpy(flow, choices, unit_cost, weight, via_family, via_from, via_to):
+    weight[:, :] = np.inf
+    family, k = np.nonzero(flow)
+    n_choices = flow.shape[1]
+
+    if len(family) == 0:
+        return
+
+    family = np.repeat(family, n_choices)
+    k = np.repeat(k, n_choices)
+    k2 = np.tile(np.arange(n_choices), len(family) // n_choices)
+    keep = k != k2
+    family, k, k2 = family[keep], k[keep], k2[keep]
+
+    d = choices[family, k]
+    d2 = choices[family, k2]
+    cost = unit_cost[family, k2] - unit_cost[family, k]
+
+    # The first entry of each (d, d2) pair after sorting by cost is the cheapest family
+    order = np.lexsort((cost, d2, d))
+    pair = d[order] * (N_DAYS + 1) + d2[order]
+    first = order[np.r_[True, pair[1:] != pair[:-1]]]
+
+    weight[d[first], d2[first]] = cost[first]
+    via_family[d[first], d2[first]] = family[first]
+    via_from[d[first], d2[first]] = k[first]
+    via_to[d[first], d2[first]] = k2[first]
+
+
+def _shortest_paths_numpy(start_cost, weight, dist, pred):
+    dist[:] = start_cost
+    pred[:] = -1
+
+    for _ in range(N_DAYS):
+        candidate = dist[:, None] + weight
+        best = candidate.argmin(axis=0)
+        best_cost = candidate[best, np.arange(N_DAYS + 1)]
+        improved = best_cost < dist - 1e-9
+
+        if not improved.any():
+            break
+
+        dist[improved] = best_cost[improved]
+        pred[improved] = best[improved]
+
+
+# Solve the preference-only problem as a min-cost flow ------------
+def preference_flow(family_size, family_choices, preference_cost, top_k=N_CHOICES, lower=None, upper=None,
+                    use_numba=None):
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+
+    day_graph = _day_graph_numba if use_numba else _day_graph_numpy
+    shortest_paths = _shortest_paths_numba if use_numba else _shortest_paths_numpy
+    start_timestamp = datetime.now()
+    lower, upper = occupancy_limits(lower, upper)
+
+    family_size = np.asarray(family_size, dtype=np.int64)
+    choices = np.ascontiguousarray(np.asarray(family_choices)[:, :top_k], dtype=np.int64)
+    unit_cost = np.asarray(preference_cost)[np.arange(len(family_size))[:, None], choices] / family_size[:, None]
+    flow = np.zeros(choices.shape, dtype=np.int64)
+    occupancy = np.zeros(N_DAYS + 1, dtype=np.int64)
+
+    weight = np.empty((N_DAYS + 1, N_DAYS + 1))
+    via_family = np.zeros((N_DAYS + 1, N_DAYS + 1), dtype=np.int64)
+    via_from = np.zeros((N_DAYS + 1, N_DAYS + 1), dtype=np.int64)
+    via_to = np.zeros((N_DAYS + 1, N_DAYS + 1), dtype=np.int64)
+    dist = np.empty(N_DAYS + 1)
+    pred = np.empty(N_DAYS + 1, dtype=np.int64)
+    augmentations = 0
+
+    # Successive shortest paths, sending each family's people from the family to the sink through the days
+    for family in range(len(family_size)):
+        remaining = family_size[family]
+
+        while remaining > 0:
+            day_graph(flow, choices, unit_cost, weight, via_family, via_from, via_to)
+
+            start_cost = np.full(N_DAYS + 1, np.inf)
+            start_cost[choices[family]] = unit_cost[family]
+            shortest_paths(start_cost, weight, dist, pred)
+
+            sink_cost = np.where(occupancy < lower, -LOWER_BOUND_CREDIT, 0.0)
+            sink_cost[occupancy >= upper] = np.inf
+            sink_cost[0] = np.inf
+            end_day = int(np.argmin(dist + sink_cost))
+
+            if not np.isfinite(dist[end_day] + sink_cost[end_day]):
+                raise ValueError('Family %d cannot be placed on any of its top %d choices' % (family, top_k))
+
+            # Send as many people as the path, the family and the occupancy tier of the last day allow
+            amount = min(remaining, (lower if occupancy[end_day] < lower[end_day] else upper)[end_day] -
+                         occupancy[end_day])
+            day = end_day
+
+            while pred[day] != -1:
+                amount = min(amount, flow[via_family[pred[day], day], via_from[pred[day], day]])
+                day = pred[day]
+
+            day = end_day
+
+            while pred[day] != -1:
+                previous_day = pred[day]
+                flow[via_family[previous_day, day], via_from[previous_day, day]] -= amount
+                flow[via_family[previous_day, day], via_to[previous_day, day]] += amount
+                day = previous_day
+
+            flow[family, np.nonzero(choices[family] == day)[0][0]] += amount
+            occupancy[end_day] += amount
+            remaining -= amount
+            augmentations += 1
+
+    if np.any(occupancy[1:] < lower[1:]):
+        raise ValueError('The top %d choices cannot meet the minimum occupancy on every day' % top_k)
+
+    stats = {'lower_bound': float((flow * unit_cost).sum()), 'augmentations': augmentations,
+             'split_families': int(((flow > 0).sum(axis=1) > 1).sum()),
+             'run_time': (datetime.now() - start_timestamp).total_seconds()}
+
+    return flow, stats
+
+
+# Round the flow and repair the attendance limits -----------------
+def round_flow(flow, family_choices):
+    choices = np.asarray(family_choices)[:, :flow.shape[1]]
+
+    # Each family goes to the day holding most of its people
+    return choices[np.arange(len(flow)), flow.argmax(axis=1)].astype(np.int64)
+
+
+def repair_assignment(assignment, family_size, preference_cost, family_choices, top_k=N_CHOICES, lower=None,
+                      upper=None):
+    lower, upper = occupancy_limits(lower, upper)
+    assignment = np.array(assignment, dtype=np.int64)
+    family_size = np.asarray(family_size, dtype=np.int64)
+    preference_cost = np.asarray(preference_cost)
+    choices = np.asarray(family_choices)[:, :top_k].astype(np.int64)
+    occupancy = daily_occupancy(assignment, family_size)
+    families = np.arange(len(assignment))
+
+    # Move the cheapest family off each overfull day, or onto each underfull day, until all days are within limits
+    while True:
+        over = np.nonzero(occupancy[1:] > upper[1:])[0] + 1
+        under = np.nonzero(occupancy[1:] < lower[1:])[0] + 1
+
+        if len(over) == 0 and len(under) == 0:
+            break
+
+        if len(over) > 0:
+            day = over[0]
+            members = families[assignment == day]
+            delta = preference_cost[members, 1:] - preference_cost[members, day][:, None]
+            room = occupancy[None, 1:] + family_size[members][:, None] <= upper[None, 1:]
+            delta = np.where(room, delta, np.inf).astype(np.float64)
+            delta[:, day - 1] = np.inf
+            member, new_day = np.unravel_index(np.argmin(delta), delta.shape)
+            family, new_day = members[member], new_day + 1
+        else:
+            day = under[0]
+            delta = (preference_cost[:, day] - preference_cost[families, assignment]).astype(np.float64)
+            spare = (occupancy[assignment] - family_size >= lower[assignment]) | \
+                (occupancy[assignment] > upper[assignment])
+            delta[~spare | (assignment == day) | (occupancy[day] + family_size > upper[day])] = np.inf
+            family, new_day = int(np.argmin(delta)), day
+
+        if not np.isfinite(delta).any():
+            raise ValueError('Could not repair the attendance on day %d' % day)
+
+        occupancy[assignment[family]] -= family_size[family]
+        occupancy[new_day] += family_size[family]
+        assignment[family] = new_day
+
+    # Then move families back to cheaper choices wherever the limits allow
+    improved = True
+
+    while improved:
+        improved = False
+
+        for family in range(len(assignment)):
+            day = assignment[family]
+
+            for new_day in choices[family]:
+                if preference_cost[family, new_day] >= preference_cost[family, day]:
+                    break
+
+                if occupancy[new_day] + family_size[family] <= upper[new_day] and \
+                        occupancy[day] - family_size[family] >= lower[day]:
+                    occupancy[day] -= family_size[family]
+                    occupancy[new_day] += family_size[family]
+                    assignment[family] = new_day
+                    improved = True
+                    break
+
+    return assignment
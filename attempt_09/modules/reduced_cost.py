@@ -0,0 +1,96 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from datetime import datetime
+
+from tour_data import N_DAYS
+from scoring import score, is_feasible
+from tour_model import build_problem, start_values, assignment_from_values
+from solver_backend import make_backend
+
+
+# Solve the LP relaxation once ------------------------------------
+def lp_relaxation(problem, solver='highs', time_limit=None):
+    backend = make_backend(solver, problem._replace(vtype=np.full(len(problem.objective), 'C')))
+    result = backend.solve(time_limit=time_limit)
+
+    if result.status != 'optimal':
+        raise ValueError('The LP relaxation did not solve to optimality: %s' % result.status)
+
+    return result.objective, backend.get_values(attribute='RC')
+
+
+# Fix columns whose reduced cost exceeds the gap ------------------
+# Any schedule costs at least the LP bound plus the reduced cost of every column it uses that the LP left at zero. A
+# visit or accounting column whose reduced cost exceeds incumbent - bound can therefore only appear in schedules worse
+# than the incumbent, and is dropped. The bound and reduced costs stay valid, so a better incumbent prunes further.
+class ReducedCostFixing:
+    def __init__(self, problem, bound, reduced_cost, tolerance=1e-4):
+        self.problem = problem
+        self.bound = bound
+        self.reduced_cost = np.asarray(reduced_cost)
+        self.tolerance = tolerance
+        self.n_visit = len(problem.visit_family)
+        self.accounting_offset = self.n_visit + N_DAYS
+
+    def keep(self, incumbent):
+        threshold = incumbent - self.bound + self.tolerance
+
+        return self.reduced_cost[:self.n_visit] <= threshold, \
+            self.reduced_cost[self.accounting_offset:] <= threshold
+
+    def survivors(self, incumbent):
+        visit, accounting = self.keep(incumbent)
+
+        return {'visit': int(visit.sum()), 'accounting': int(accounting.sum()),
+                'columns': int(visit.sum() + accounting.sum()) + N_DAYS,
+                'full_columns': len(self.problem.objective)}
+
+    def prune(self, incumbent, family_size, family_choices, preference_cost, accounting_cost, timer=None):
+        problem = self.problem
+        visit, accounting = self.keep(incumbent)
+
+        return build_problem(family_size, family_choices, preference_cost, accounting_cost,
+                             (problem.accounting_day[accounting], problem.accounting_day_0[accounting],
+                              problem.accounting_day_1[accounting]),
+                             visit_options=(problem.visit_family[visit], problem.visit_day[visit]), timer=timer)
+
+
+def fixing_search(fixing, assignment, family_size, family_choices, preference_cost, accounting_cost, solver='gurobi',
+                  time_limit=600, mip_gap=0, max_rounds=10, callback=None):
+    # Re-prune at every new incumbent, until the pruned MIP is solved to optimality or stops improving
+    assignment = np.array(assignment, dtype=np.int64)
+    cost = sum(score(assignment, preference_cost, family_size)[:2])
+    start_timestamp = datetime.now()
+    stats = {'round': 0, 'start_cost': cost, 'cost': cost, 'optimal': False}
+
+    while stats['round'] < max_rounds:
+        problem = fixing.prune(cost, family_size, family_choices, preference_cost, accounting_cost)
+        backend = make_backend(solver, problem)
+        backend.set_start(start_values(problem, assignment, family_size))
+        result = backend.solve(time_limit=time_limit, mip_gap=mip_gap)
+
+        stats['round'] += 1
+        stats.update(fixing.survivors(cost), status=result.status, bound=result.bound,
+                     run_time=(datetime.now() - start_timestamp).total_seconds())
+
+        improved = False
+
+        if result.values is not None:
+            solved = assignment_from_values(problem, result.values)
+            preference_penalty, accounting_penalty, occupancy = score(solved, preference_cost, family_size)
+
+            if is_feasible(occupancy) and preference_penalty + accounting_penalty < cost - 1e-6:
+                assignment, cost, improved = solved, preference_penalty + accounting_penalty, True
+
+        stats['cost'] = cost
+
+        # The fixing is exact, so a pruned MIP solved with no gap is optimal for the full model
+        stats['optimal'] = result.status == 'optimal' and not mip_gap
+
+        if callback is not None:
+            callback(dict(stats))
+
+        if stats['optimal'] or not improved:
+            break
+
+    return assignment, stats
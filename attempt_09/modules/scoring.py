@@ -0,0 +1,188 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+
+from tour_data import N_DAYS, MIN_OCCUPANCY, MAX_OCCUPANCY, build_accounting_table
+
+
+# Define vectorized penalty functions -----------------------------
+def daily_occupancy(assignment, family_size):
+    return np.bincount(assignment, weights=family_size, minlength=N_DAYS + 1).astype(np.int64)
+
+
+def accounting_penalties(occupancy):
+    today_visitors = occupancy[1:N_DAYS + 1].astype(np.float64)
+    yesterday_visitors = np.append(today_visitors[1:], today_visitors[-1])
+
+    return (today_visitors - 125.0) / 400.0 * today_visitors ** \
+        (0.5 + np.abs(today_visitors - yesterday_visitors) / 50.0)
+
+
+def is_feasible(occupancy):
+    daily_visitors = occupancy[1:N_DAYS + 1]
+
+    return bool(np.all((daily_visitors >= MIN_OCCUPANCY) & (daily_visitors <= MAX_OCCUPANCY)))
+
+
+def score(assignment, cost_matrix, family_size):
+    occupancy = daily_occupancy(assignment, family_size)
+    preference_penalty = int(cost_matrix[np.arange(len(assignment)), assignment].sum())
+    accounting_penalty = float(accounting_penalties(occupancy).sum())
+
+    return preference_penalty, accounting_penalty, occupancy
+
+
+def total_cost(assignment, cost_matrix, family_size):
+    preference_penalty, accounting_penalty, _ = score(assignment, cost_matrix, family_size)
+
+    return preference_penalty + accounting_penalty
+
+
+# Define incremental evaluator for single-family moves ------------
+def accounting_penalty(today_visitors, yesterday_visitors):
+    return (today_visitors - 125.0) / 400.0 * today_visitors ** \
+        (0.5 + abs(today_visitors - yesterday_visitors) / 50.0)
+
+
+class DeltaEvaluator:
+    def __init__(self, assignment, cost_matrix, family_size, accounting=None):
+        self.assignment = np.array(assignment, dtype=np.int64)
+        self.cost_matrix = cost_matrix
+        self.family_size = np.asarray(family_size, dtype=np.int64)
+        self.accounting = build_accounting_table() if accounting is None else accounting
+        self._accounting = self.accounting.tolist()
+        self.reset(self.assignment)
+
+    def reset(self, assignment):
+        self.assignment[:] = assignment
+        occupancy = daily_occupancy(self.assignment, self.family_size)
+
+        # Python lists keep scalar lookups in the move loop cheap
+        self._assignment = self.assignment.tolist()
+        self._family_size = self.family_size.tolist()
+        self._occupancy = occupancy.tolist()
+        self._penalties = [0.0] + accounting_penalties(occupancy).tolist()
+        self.preference_penalty = int(self.cost_matrix[np.arange(len(self._assignment)), self.assignment].sum())
+        self.accounting_penalty = sum(self._penalties)
+
+    @property
+    def occupancy(self):
+        return np.array(self._occupancy, dtype=np.int64)
+
+    @property
+    def total_cost(self):
+        return self.preference_penalty + self.accounting_penalty
+
+    def is_feasible_changes(self, changes):
+        for d, people in changes.items():
+            if not MIN_OCCUPANCY <= self._occupancy[d] + people <= MAX_OCCUPANCY:
+                return False
+
+        return True
+
+    def is_feasible_move(self, family, day):
+        b_prev = self._assignment[family]
+        n_people = self._family_size[family]
+
+        return day == b_prev or (self._occupancy[b_prev] - n_people >= MIN_OCCUPANCY and
+                                 self._occupancy[day] + n_people <= MAX_OCCUPANCY)
+
+    def is_feasible_swap(self, family_a, family_b):
+        return self.is_feasible_changes(self._swap_changes(family_a, family_b))
+
+    def _move_changes(self, family, day):
+        return {self._assignment[family]: -self._family_size[family], day: self._family_size[family]}
+
+    def _swap_changes(self, family_a, family_b):
+        people = self._family_size[family_b] - self._family_size[family_a]
+
+        return {self._assignment[family_a]: people, self._assignment[family_b]: -people}
+
+    def _affected_penalties(self, changes):
+        occupancy = self._occupancy
+        penalties = []
+
+        for d in set(changes) | {d - 1 for d in changes}:
+            if d < 1:
+                continue
+
+            today_visitors = occupancy[d] + changes.get(d, 0)
+
+            if d == N_DAYS:
+                yesterday_visitors = today_visitors
+            else:
+                yesterday_visitors = occupancy[d + 1] + changes.get(d + 1, 0)
+
+            # Only moves that break the attendance limits fall outside the lookup table
+            if MIN_OCCUPANCY <= today_visitors <= MAX_OCCUPANCY and \
+                    MIN_OCCUPANCY <= yesterday_visitors <= MAX_OCCUPANCY:
+                penalty = self._accounting[today_visitors - MIN_OCCUPANCY][yesterday_visitors - MIN_OCCUPANCY]
+            else:
+                penalty = accounting_penalty(today_visitors, yesterday_visitors)
+
+            penalties.append((d, penalty))
+
+        return penalties
+
+    def _preference_delta(self, moves):
+        return int(sum(self.cost_matrix[f, d] - self.cost_matrix[f, self._assignment[f]] for f, d in moves))
+
+    def _delta(self, moves, changes):
+        delta = float(self._preference_delta(moves))
+
+        for d, penalty in self._affected_penalties(changes):
+            delta += penalty - self._penalties[d]
+
+        return delta
+
+    def _apply(self, moves, changes):
+        preference_delta = self._preference_delta(moves)
+        delta = float(preference_delta)
+        self.preference_penalty += preference_delta
+
+        for d, penalty in self._affected_penalties(changes):
+            delta += penalty - self._penalties[d]
+            self.accounting_penalty += penalty - self._penalties[d]
+            self._penalties[d] = penalty
+
+        for d, people in changes.items():
+            self._occupancy[d] += people
+
+        for f, d in moves:
+            self._assignment[f] = d
+            self.assignment[f] = d
+
+        return delta
+
+    def move_delta(self, family, day):
+        if day == self._assignment[family]:
+            return 0.0
+
+        return self._delta([(family, day)], self._move_changes(family, day))
+
+    def move(self, family, day):
+        if day == self._assignment[family]:
+            return 0.0
+
+        return self._apply([(family, day)], self._move_changes(family, day))
+
+    def swap_delta(self, family_a, family_b):
+        day_a = self._assignment[family_a]
+        day_b = self._assignment[family_b]
+
+        if day_a == day_b:
+            return 0.0
+
+        return self._delta([(family_a, day_b), (family_b, day_a)], self._swap_changes(family_a, family_b))
+
+    def swap(self, family_a, family_b):
+        day_a = self._assignment[family_a]
+        day_b = self._assignment[family_b]
+
+        if day_a == day_b:
+            return 0.0
+
+        return self._apply([(family_a, day_b), (family_b, day_a)], self._swap_changes(family_a, family_b))
+
+    def resync(self):
+        # Clear any floating point drift from accumulated deltas
+        self.reset(self.assignment.copy())
@@ -0,0 +1,109 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import hashlib
+import sqlite3
+import json
+import glob
+import os
+from collections import namedtuple
+from datetime import datetime
+
+from scoring import score
+from solution_io import read_warm_start
+
+ARCHIVE_PATH = 'attempt_09/artifacts/solutions.sqlite'
+
+ArchivedSolution = namedtuple('ArchivedSolution', ['hash', 'cost', 'preference', 'accounting', 'source',
+                                                   'parameters', 'assignment'])
+
+
+# Store every schedule once, keyed by a hash of its days ----------
+# Days fit in uint8, so each schedule is a 5,000-byte blob and the hash of those bytes deduplicates across attempts
+def solution_hash(assignment):
+    return hashlib.sha256(np.asarray(assignment, dtype=np.uint8).tobytes()).hexdigest()[:16]
+
+
+class SolutionArchive:
+    def __init__(self, path=ARCHIVE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS solutions (hash TEXT PRIMARY KEY, cost REAL, '
+                                'preference REAL, accounting REAL, source TEXT, parameters TEXT, created TEXT, '
+                                'assignment BLOB)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS solutions_cost ON solutions (cost)')
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def add(self, assignment, cost_matrix, family_size, source, parameters=None):
+        # Returns the hash and whether the schedule was new to the archive
+        assignment = np.asarray(assignment, dtype=np.uint8)
+        key = solution_hash(assignment)
+        preference_penalty, accounting_penalty, _ = score(assignment.astype(np.int64), cost_matrix, family_size)
+
+        cursor = self.connection.execute('INSERT OR IGNORE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                         (key, preference_penalty + accounting_penalty, preference_penalty,
+                                          accounting_penalty, source, json.dumps(parameters or {}),
+                                          datetime.now().isoformat(), assignment.tobytes()))
+        self.connection.commit()
+
+        return key, cursor.rowcount == 1
+
+    def import_files(self, pattern, cost_matrix, family_size, source=None, parameters=None):
+        added = 0
+
+        for path in sorted(glob.glob(pattern)):
+            # The attempt folder is the source unless one is given
+            _, new = self.add(read_warm_start(path), cost_matrix, family_size,
+                              source or path.split(os.sep)[0], dict(parameters or {}, path=path))
+            added += new
+
+        return added
+
+    def _solutions(self, rows):
+        return [ArchivedSolution(key, cost, preference, accounting, source, json.loads(parameters),
+                                 np.frombuffer(assignment, dtype=np.uint8).astype(np.int64))
+                for key, cost, preference, accounting, source, parameters, assignment in rows]
+
+    def top(self, k=10, source=None):
+        query = 'SELECT hash, cost, preference, accounting, source, parameters, assignment FROM solutions'
+        query += ' WHERE source = ?' if source is not None else ''
+
+        return self._solutions(self.connection.execute(query + ' ORDER BY cost LIMIT ?',
+                                                       (source, k) if source is not None else (k,)).fetchall())
+
+    def get(self, key):
+        return self._solutions(self.connection.execute('SELECT hash, cost, preference, accounting, source, '
+                                                       'parameters, assignment FROM solutions WHERE hash = ?',
+                                                       (key,)).fetchall())[0]
+
+    def assignments(self):
+        # Every schedule as one uint8 matrix, in the same order as the returned hashes
+        rows = self.connection.execute('SELECT hash, assignment FROM solutions ORDER BY cost').fetchall()
+        matrix = np.frombuffer(b''.join(r[1] for r in rows), dtype=np.uint8).reshape(len(rows), -1)
+
+        return [r[0] for r in rows], matrix
+
+    def hamming(self, incumbent):
+        # Number of families on a different day than the incumbent, for every archived schedule
+        keys, matrix = self.assignments()
+
+        return keys, (matrix != np.asarray(incumbent, dtype=np.uint8)[None, :]).sum(axis=1)
+
+    def diverse(self, k=5, max_cost=None):
+        # Greedily pick schedules far from those already picked, starting from the cheapest
+        keys, matrix = self.assignments()
+        costs = np.array([r[0] for r in self.connection.execute('SELECT cost FROM solutions ORDER BY cost')])
+        candidates = np.nonzero(costs <= max_cost)[0] if max_cost is not None else np.arange(len(keys))
+        picked = [int(candidates[0])] if len(candidates) else []
+        distance = (matrix[candidates] != matrix[picked[0]][None, :]).sum(axis=1) if picked else None
+
+        while len(picked) < min(k, len(candidates)):
+            picked.append(int(candidates[distance.argmax()]))
+            distance = np.minimum(distance, (matrix[candidates] != matrix[picked[-1]][None, :]).sum(axis=1))
+
+        return [self.get(keys[i]) for i in picked]
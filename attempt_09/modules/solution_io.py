@@ -0,0 +1,81 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import pandas as pd
+import math
+
+from tour_data import N_FAMILIES, N_DAYS, MIN_OCCUPANCY, MAX_OCCUPANCY
+from scoring import daily_occupancy, score, is_feasible
+
+
+# Read and write Kaggle submissions -------------------------------
+def read_assignment(path):
+    solution = pd.read_csv(path).sort_values('family_id')
+
+    return solution['assigned_day'].values.astype(np.int64)
+
+
+def read_solution_sol(path):
+    # Only the x_f_d lines set to one are needed, and they are parsed in one vectorized pass
+    solution = pd.read_csv(path, sep=' ', comment='#', header=None, names=['name', 'value'])
+    visits = solution['name'].str.extract(r'^x_(\d+)_(\d+)$').dropna().astype(np.int64)
+    visits = visits[solution.loc[visits.index, 'value'].values > 0.5]
+
+    # A partial or corrupted file would otherwise leave families on day 0 without complaint
+    families, days = visits[0].values, visits[1].values
+
+    if not np.array_equal(np.sort(families), np.arange(N_FAMILIES)) or days.min() < 1 or days.max() > N_DAYS:
+        raise ValueError('%s does not assign each of the %d families to one day in 1..%d' % (path, N_FAMILIES,
+                                                                                             N_DAYS))
+
+    assignment = np.zeros(N_FAMILIES, dtype=np.int64)
+    assignment[families] = days
+
+    return assignment
+
+
+def read_warm_start(path):
+    # Warm starts can be Kaggle submissions or Gurobi solution files from any attempt
+    return read_solution_sol(path) if path.endswith('.sol') else read_assignment(path)
+
+
+def write_solution_csv(path, assignment):
+    solution = pd.DataFrame({'family_id': np.arange(len(assignment)), 'assigned_day': assignment})
+    solution.to_csv(path, index=False)
+
+
+def export_solution(path, assignment, cost_matrix, family_size):
+    # Check the attendance limits and rescore exactly before anything is written
+    assignment = np.asarray(assignment, dtype=np.int64)
+
+    if np.any((assignment < 1) | (assignment > N_DAYS)):
+        raise ValueError('Every family needs a day between 1 and %d' % N_DAYS)
+
+    preference_penalty, accounting_penalty, occupancy = score(assignment, cost_matrix, family_size)
+
+    if not is_feasible(occupancy):
+        day = int(np.argmax((occupancy[1:] < MIN_OCCUPANCY) | (occupancy[1:] > MAX_OCCUPANCY))) + 1
+        raise ValueError('Day %d has %d people, outside the attendance limits' % (day, occupancy[day]))
+
+    # A %d in the path is filled with the floored score, as in the tour_solution_<score>.csv outputs
+    write_solution_csv(path % math.floor(preference_penalty + accounting_penalty) if '%d' in path else path,
+                       assignment)
+
+    return preference_penalty, accounting_penalty
+
+
+# Write Gurobi solution files -------------------------------------
+def write_solution_sol(path, assignment, family_size, objective_value, accounting=True):
+    occupancy = daily_occupancy(assignment, family_size)
+    lines = ['# Objective value = %.6f' % objective_value]
+    lines += ['x_%d_%d 1' % (f, d) for f, d in enumerate(assignment)]
+
+    # Attendance and accounting variables only exist in the attempt_04-08 models
+    if accounting:
+        for d in range(1, N_DAYS + 1):
+            today_visitors = occupancy[d]
+            yesterday_visitors = occupancy[d + 1] if d != N_DAYS else occupancy[d]
+            lines.append('attendance_%d %d' % (d, today_visitors))
+            lines.append('accounting_%d_%d_%d 1' % (d, today_visitors, yesterday_visitors))
+
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
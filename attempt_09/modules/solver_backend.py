@@ -0,0 +1,288 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from collections import namedtuple
+
+from tour_model import PhaseTimer, column_names, row_names
+
+SolveResult = namedtuple('SolveResult', ['status', 'objective', 'bound', 'values', 'run_time',
+                                         'first_feasible_time', 'target_gap_time'])
+
+
+# Track time to first feasible and time to target gap -------------
+class SolveProgress:
+    def __init__(self, target_gap=None, on_progress=None):
+        self.target_gap = target_gap
+        self.on_progress = on_progress
+        self.first_feasible_time = None
+        self.target_gap_time = None
+
+    def record(self, run_time, objective, bound):
+        if objective is None or not np.isfinite(objective):
+            return
+
+        if self.first_feasible_time is None:
+            self.first_feasible_time = run_time
+
+        gap = abs(objective - bound) / max(abs(objective), 1e-10)
+
+        if self.target_gap_time is None and self.target_gap is not None and gap <= self.target_gap:
+            self.target_gap_time = run_time
+
+        if self.on_progress is not None:
+            self.on_progress({'run_time': run_time, 'objective': objective, 'bound': bound, 'gap': gap})
+
+    def finish(self, run_time, objective, bound):
+        # Solvers do not always report the final incumbent or bound through a callback
+        if objective is not None and (self.first_feasible_time is None or self.target_gap_time is None):
+            self.record(run_time, objective, bound)
+
+
+def _row_senses(problem):
+    # Tour problems only have equality rows, sub-problems may carry their own senses
+    sense = getattr(problem, 'sense', None)
+
+    return np.full(len(problem.rhs), '=') if sense is None else np.asarray(sense)
+
+
+def _polish_start(backend, heuristic):
+    # Solvers only report incumbents they find themselves, so the heuristic sees the MIP start before the solve
+    if heuristic is None or backend.start is None:
+        return
+
+    polished = heuristic.on_incumbent(backend.start, float(backend.problem.objective @ backend.start))
+
+    if polished is not None:
+        backend.set_start(polished[0])
+
+
+# Define Gurobi backend -------------------------------------------
+class GurobiBackend:
+    name = 'gurobi'
+
+    def __init__(self, problem, names=False, timer=None):
+        import gurobipy as grb
+
+        self.grb = grb
+        self.problem = problem
+        self.start = None
+        timer = timer or PhaseTimer()
+        self.model = grb.Model()
+        self.model.ModelSense = grb.GRB.MINIMIZE
+
+        self.vars = self.model.addMVar(len(problem.objective), lb=problem.lower, ub=problem.upper,
+                                       obj=problem.objective, vtype=problem.vtype)
+        timer.lap('gurobi_variables')
+
+        self.constrs = self.model.addMConstr(problem.constraint_matrix, self.vars, _row_senses(problem), problem.rhs)
+        self.model.update()
+        timer.lap('gurobi_constraints')
+
+        # Names are only needed to read or write .lp/.sol files by name
+        if names:
+            self.model.setAttr('VarName', self.model.getVars(), column_names(problem))
+            self.model.setAttr('ConstrName', self.model.getConstrs(), row_names(problem))
+            self.model.update()
+            timer.lap('names')
+
+    def set_param(self, name, value):
+        self.model.setParam(name, value)
+
+    def set_start(self, values, columns=None):
+        # Starts and values are set or read in bulk through the MVar, optionally for a subset of columns
+        if columns is None:
+            self.vars.Start = values
+            self.start = np.asarray(values, dtype=np.float64)
+        else:
+            self.vars[columns].setAttr('Start', values)
+            self.start = None
+
+    def get_values(self, columns=None, attribute='X'):
+        return (self.vars if columns is None else self.vars[columns]).getAttr(attribute)
+
+    def solve(self, time_limit=None, mip_gap=None, target_gap=None, on_progress=None, heuristic=None):
+        grb = self.grb
+        progress = SolveProgress(target_gap, on_progress)
+        pending = []
+        _polish_start(self, heuristic)
+
+        if time_limit is not None:
+            self.model.setParam('TimeLimit', time_limit)
+        if mip_gap is not None:
+            self.model.setParam('MIPGap', mip_gap)
+
+        def progress_callback(model, where):
+            if where == grb.GRB.Callback.MIPSOL:
+                progress.record(model.cbGet(grb.GRB.Callback.RUNTIME), model.cbGet(grb.GRB.Callback.MIPSOL_OBJBST),
+                                model.cbGet(grb.GRB.Callback.MIPSOL_OBJBND))
+
+                if heuristic is not None:
+                    polished = heuristic.on_incumbent(model.cbGetSolution(self.vars),
+                                                      model.cbGet(grb.GRB.Callback.MIPSOL_OBJ))
+                    pending[:] = [polished[0]] if polished is not None else pending
+            elif where == grb.GRB.Callback.MIP:
+                progress.record(model.cbGet(grb.GRB.Callback.RUNTIME), model.cbGet(grb.GRB.Callback.MIP_OBJBST),
+                                model.cbGet(grb.GRB.Callback.MIP_OBJBND))
+            elif where == grb.GRB.Callback.MIPNODE and heuristic is not None:
+                run_time = model.cbGet(grb.GRB.Callback.RUNTIME)
+
+                if not pending and model.cbGet(grb.GRB.Callback.MIPNODE_STATUS) == grb.GRB.OPTIMAL and \
+                        heuristic.wants_relaxation(run_time):
+                    polished = heuristic.on_relaxation(model.cbGetNodeRel(self.vars), run_time)
+                    pending[:] = [polished[0]] if polished is not None else []
+
+                # Solutions found at MIPSOL wait for the next node, the only place they can be handed back
+                if pending:
+                    model.cbSetSolution(self.vars, pending.pop())
+                    model.cbUseSolution()
+
+        self.model.optimize(progress_callback)
+
+        statuses = {grb.GRB.OPTIMAL: 'optimal', grb.GRB.TIME_LIMIT: 'time_limit', grb.GRB.INFEASIBLE: 'infeasible',
+                    grb.GRB.INF_OR_UNBD: 'infeasible', grb.GRB.CUTOFF: 'cutoff', grb.GRB.INTERRUPTED: 'interrupted'}
+        has_solution = self.model.SolCount > 0
+        objective = self.model.ObjVal if has_solution else None
+        bound = self.model.ObjBound if self.model.IsMIP else objective
+        progress.finish(self.model.Runtime, objective, bound)
+
+        return SolveResult(statuses.get(self.model.Status, str(self.model.Status)), objective, bound,
+                           self.vars.X if has_solution else None,
+                           self.model.Runtime, progress.first_feasible_time, progress.target_gap_time)
+
+
+# Define HiGHS backend --------------------------------------------
+class HighsBackend:
+    name = 'highs'
+
+    def __init__(self, problem, names=False, timer=None):
+        import highspy
+
+        self.highspy = highspy
+        self.problem = problem
+        self.start = None
+        timer = timer or PhaseTimer()
+        self.model = highspy.Highs()
+        self.model.setOptionValue('output_flag', False)
+
+        sense = _row_senses(problem)
+        row_lower = np.where(sense == '<', -np.inf, problem.rhs)
+        row_upper = np.where(sense == '>', np.inf, problem.rhs)
+        constraint_matrix = problem.constraint_matrix.tocsc()
+
+        lp = highspy.HighsLp()
+        lp.num_col_ = len(problem.objective)
+        lp.num_row_ = len(problem.rhs)
+        lp.col_cost_ = np.asarray(problem.objective, dtype=np.float64)
+        lp.col_lower_ = np.asarray(problem.lower, dtype=np.float64)
+        lp.col_upper_ = np.asarray(problem.upper, dtype=np.float64)
+        lp.row_lower_ = row_lower.astype(np.float64)
+        lp.row_upper_ = row_upper.astype(np.float64)
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = constraint_matrix.indptr
+        lp.a_matrix_.index_ = constraint_matrix.indices
+        lp.a_matrix_.value_ = constraint_matrix.data
+        lp.integrality_ = np.where(np.asarray(problem.vtype) == 'C', highspy.HighsVarType.kContinuous,
+                                   highspy.HighsVarType.kInteger).tolist()
+        timer.lap('highs_variables')
+
+        self.model.passModel(lp)
+        timer.lap('highs_constraints')
+
+        # HiGHS keeps no names worth writing, so names are ignored
+        self.names = names
+
+    def set_param(self, name, value):
+        self.model.setOptionValue(name, value)
+
+    def set_start(self, values, columns=None):
+        # HiGHS takes a full start, so columns outside the subset start at zero
+        col_value = np.asarray(values, dtype=np.float64)
+
+        if columns is not None:
+            col_value = np.zeros(len(self.problem.objective))
+            col_value[columns] = values
+
+        solution = self.highspy.HighsSolution()
+        solution.col_value = col_value
+        self.model.setSolution(solution)
+        self.start = col_value
+
+    def get_values(self, columns=None, attribute='X'):
+        # Column duals are HiGHS's reduced costs, the only other column attribute used here
+        solution = self.model.getSolution()
+        values = np.array(solution.col_dual if attribute == 'RC' else solution.col_value)
+
+        return values if columns is None else values[columns]
+
+    def solve(self, time_limit=None, mip_gap=None, target_gap=None, on_progress=None, heuristic=None):
+        highspy = self.highspy
+        progress = SolveProgress(target_gap, on_progress)
+        pending = []
+        _polish_start(self, heuristic)
+
+        if time_limit is not None:
+            self.model.setOptionValue('time_limit', float(time_limit))
+        if mip_gap is not None:
+            self.model.setOptionValue('mip_rel_gap', float(mip_gap))
+
+        def progress_callback(e):
+            progress.record(e.data_out.running_time, e.data_out.objective_function_value, e.data_out.mip_dual_bound)
+
+        def incumbent_callback(e):
+            progress_callback(e)
+            polished = heuristic.on_incumbent(np.array(e.data_out.mip_solution), e.data_out.objective_function_value)
+            pending[:] = [polished[0]] if polished is not None else pending
+
+        def user_solution_callback(e):
+            # HiGHS exposes no node relaxations, so only polished incumbents are handed back
+            if pending:
+                e.data_in.setSolution(pending.pop())
+
+        callbacks = [(self.model.cbMipImprovingSolution,
+                      progress_callback if heuristic is None else incumbent_callback),
+                     (self.model.cbMipInterrupt, progress_callback)]
+
+        if heuristic is not None:
+            callbacks.append((self.model.cbMipUserSolution, user_solution_callback))
+
+        for event, callback in callbacks:
+            event.subscribe(callback)
+
+        try:
+            self.model.run()
+        finally:
+            for event, callback in callbacks:
+                event.unsubscribe(callback)
+
+        statuses = {highspy.HighsModelStatus.kOptimal: 'optimal', highspy.HighsModelStatus.kTimeLimit: 'time_limit',
+                    highspy.HighsModelStatus.kInfeasible: 'infeasible',
+                    highspy.HighsModelStatus.kInterrupt: 'interrupted'}
+        info = self.model.getInfo()
+        has_solution = info.primal_solution_status == 2
+        is_mip = bool(np.any(np.asarray(self.problem.vtype) != 'C'))
+        objective = info.objective_function_value if has_solution else None
+        bound = info.mip_dual_bound if is_mip else objective
+        progress.finish(self.model.getRunTime(), objective, bound)
+
+        return SolveResult(statuses.get(self.model.getModelStatus(), str(self.model.getModelStatus())), objective,
+                           bound, np.array(self.model.getSolution().col_value) if has_solution else None,
+                           self.model.getRunTime(), progress.first_feasible_time, progress.target_gap_time)
+
+
+BACKENDS = {'gurobi': GurobiBackend, 'highs': HighsBackend}
+
+
+def available_backends():
+    available = []
+
+    for name, module in [('gurobi', 'gurobipy'), ('highs', 'highspy')]:
+        try:
+            __import__(module)
+            available.append(name)
+        except ImportError:
+            pass
+
+    return available
+
+
+def make_backend(name, problem, names=False, timer=None):
+    return BACKENDS[name](problem, names=names, timer=timer)
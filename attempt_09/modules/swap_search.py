@@ -0,0 +1,277 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+from datetime import datetime
+
+from tour_data import N_DAYS, MIN_OCCUPANCY, MAX_OCCUPANCY, build_accounting_table
+from scoring import daily_occupancy, accounting_penalties, is_feasible
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# Define compiled swap and chain kernels --------------------------
+# A chain moves family i from d0 to d1 and family j from d1 to d2. When d2 == d0 it is a plain swap.
+@njit(cache=True)
+def _penalty(accounting, today_visitors, yesterday_visitors):
+    return accounting[today_visitors - MIN_OCCUPANCY, yesterday_visitors - MIN_OCCUPANCY]
+
+
+@njit(cache=True)
+def _new_occupancy(occupancy, d, day_a, day_b, day_c, people_a, people_b, people_c):
+    visitors = occupancy[d]
+
+    if d == day_a:
+        visitors += people_a
+    if d == day_b:
+        visitors += people_b
+    if d == day_c:
+        visitors += people_c
+
+    return visitors
+
+
+@njit(cache=True)
+def _chain_accounting_delta(accounting, occupancy, penalties, day_a, day_b, day_c, people_a, people_b, people_c):
+    for d in (day_a, day_b, day_c):
+        visitors = _new_occupancy(occupancy, d, day_a, day_b, day_c, people_a, people_b, people_c)
+
+        if visitors < MIN_OCCUPANCY or visitors > MAX_OCCUPANCY:
+            return np.inf
+
+    affected_days = (day_a - 1, day_a, day_b - 1, day_b, day_c - 1, day_c)
+    delta = 0.0
+
+    for k in range(6):
+        d = affected_days[k]
+
+        if d < 1:
+            continue
+
+        duplicate = False
+
+        for m in range(k):
+            if affected_days[m] == d:
+                duplicate = True
+                break
+
+        if duplicate:
+            continue
+
+        today_visitors = _new_occupancy(occupancy, d, day_a, day_b, day_c, people_a, people_b, people_c)
+
+        if d == N_DAYS:
+            yesterday_visitors = today_visitors
+        else:
+            yesterday_visitors = _new_occupancy(occupancy, d + 1, day_a, day_b, day_c, people_a, people_b, people_c)
+
+        delta += _penalty(accounting, today_visitors, yesterday_visitors) - penalties[d]
+
+    return delta
+
+
+@njit(cache=True)
+def _refresh_penalties(accounting, occupancy, penalties, day):
+    for d in (day - 1, day):
+        if d < 1:
+            continue
+
+        yesterday_visitors = occupancy[d] if d == N_DAYS else occupancy[d + 1]
+        penalties[d] = _penalty(accounting, occupancy[d], yesterday_visitors)
+
+
+@njit(cache=True)
+def _chain_sweep_numba(order, assignment, occupancy, penalties, accounting, family_size, cost_matrix,
+                       family_choices, member_offsets, members):
+    evaluated = 0
+    accepted = 0
+    saved = 0.0
+    top_k = family_choices.shape[1]
+
+    for idx in range(order.shape[0]):
+        i = order[idx]
+        d0 = assignment[i]
+        n_i = family_size[i]
+        best_delta = -1e-9
+        best_j = -1
+        best_d1 = -1
+        best_d2 = -1
+
+        for a in range(top_k):
+            d1 = family_choices[i, a]
+
+            if d1 == d0:
+                continue
+
+            for p in range(member_offsets[d1], member_offsets[d1 + 1]):
+                j = members[p]
+
+                if j == i or assignment[j] != d1:
+                    continue
+
+                n_j = family_size[j]
+
+                for b in range(top_k):
+                    d2 = family_choices[j, b]
+
+                    if d2 == d1:
+                        continue
+
+                    evaluated += 1
+                    delta = _chain_accounting_delta(accounting, occupancy, penalties, d0, d1, d2,
+                                                    -n_i, n_i - n_j, n_j)
+
+                    if delta == np.inf:
+                        continue
+
+                    delta += cost_matrix[i, d1] - cost_matrix[i, d0] + cost_matrix[j, d2] - cost_matrix[j, d1]
+
+                    if delta < best_delta:
+                        best_delta = delta
+                        best_j = j
+                        best_d1 = d1
+                        best_d2 = d2
+
+        if best_j >= 0:
+            n_j = family_size[best_j]
+            assignment[i] = best_d1
+            assignment[best_j] = best_d2
+            occupancy[d0] -= n_i
+            occupancy[best_d1] += n_i - n_j
+            occupancy[best_d2] += n_j
+
+            for d in (d0, best_d1, best_d2):
+                _refresh_penalties(accounting, occupancy, penalties, d)
+
+            accepted += 1
+            saved -= best_delta
+
+    return evaluated, accepted, saved
+
+
+# Define pure NumPy fallback --------------------------------------
+def _chain_sweep_numpy(order, assignment, occupancy, penalties, accounting, family_size, cost_matrix,
+                       family_choices, member_offsets, members):
+    evaluated = 0
+    accepted = 0
+    saved = 0.0
+
+    for i in order:
+        d0 = assignment[i]
+        n_i = family_size[i]
+        d1 = family_choices[i][family_choices[i] != d0]
+        j = np.concatenate([members[member_offsets[d]:member_offsets[d + 1]] for d in d1])
+        j = j[(j != i) & np.isin(assignment[j], d1)]
+
+        if len(j) == 0:
+            continue
+
+        # Expand every (j, d2) pair of the chain i: d0 -> d1, j: d1 -> d2
+        day_1 = np.repeat(assignment[j], family_choices.shape[1])
+        day_2 = family_choices[j].ravel()
+        j = np.repeat(j, family_choices.shape[1])
+        keep = day_2 != day_1
+        j, day_1, day_2 = j[keep], day_1[keep], day_2[keep]
+        n_j = family_size[j]
+        evaluated += len(j)
+
+        def new_occupancy(d):
+            return occupancy[d] - n_i * (d == d0) + (n_i - n_j) * (d == day_1) + n_j * (d == day_2)
+
+        feasible = np.ones(len(j), dtype=bool)
+
+        for d in (np.full(len(j), d0), day_1, day_2):
+            visitors = new_occupancy(d)
+            feasible &= (visitors >= MIN_OCCUPANCY) & (visitors <= MAX_OCCUPANCY)
+
+        affected_days = np.sort(np.stack([np.full(len(j), d0 - 1), np.full(len(j), d0),
+                                          day_1 - 1, day_1, day_2 - 1, day_2], axis=1), axis=1)
+        unique = np.ones(affected_days.shape, dtype=bool)
+        unique[:, 1:] = affected_days[:, 1:] != affected_days[:, :-1]
+        unique &= affected_days >= 1
+        affected_days = np.maximum(affected_days, 1)
+
+        today_visitors = np.stack([new_occupancy(affected_days[:, k]) for k in range(6)], axis=1)
+        yesterday_visitors = np.stack([new_occupancy(np.minimum(affected_days[:, k] + 1, N_DAYS))
+                                       for k in range(6)], axis=1)
+        yesterday_visitors = np.where(affected_days == N_DAYS, today_visitors, yesterday_visitors)
+        # Infeasible chains are clipped into the table here and discarded below
+        new_penalties = accounting[np.clip(today_visitors, MIN_OCCUPANCY, MAX_OCCUPANCY) - MIN_OCCUPANCY,
+                                   np.clip(yesterday_visitors, MIN_OCCUPANCY, MAX_OCCUPANCY) - MIN_OCCUPANCY]
+
+        delta = ((new_penalties - penalties[affected_days]) * unique).sum(axis=1) + \
+            cost_matrix[i, day_1] - cost_matrix[i, d0] + cost_matrix[j, day_2] - cost_matrix[j, day_1]
+        delta[~feasible] = np.inf
+        best = int(np.argmin(delta))
+
+        if delta[best] < -1e-9:
+            best_j, best_d1, best_d2 = j[best], day_1[best], day_2[best]
+            assignment[i] = best_d1
+            assignment[best_j] = best_d2
+            occupancy[d0] -= n_i
+            occupancy[best_d1] += n_i - family_size[best_j]
+            occupancy[best_d2] += family_size[best_j]
+            penalties[1:] = accounting[occupancy[1:] - MIN_OCCUPANCY,
+                                       np.append(occupancy[2:], occupancy[N_DAYS]) - MIN_OCCUPANCY]
+            accepted += 1
+            saved -= float(delta[best])
+
+    return evaluated, accepted, saved
+
+
+# Run swap and chain sweeps ---------------------------------------
+def swap_search(assignment, family_size, cost_matrix, family_choices, accounting=None, top_k=5, max_sweeps=None,
+                time_limit=None, use_numba=None, seed=None, callback=None):
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+
+    chain_sweep = _chain_sweep_numba if use_numba else _chain_sweep_numpy
+    rng = np.random.default_rng(seed)
+    assignment = np.array(assignment, dtype=np.int64)
+    family_size = np.asarray(family_size, dtype=np.int64)
+    cost_matrix = np.ascontiguousarray(cost_matrix, dtype=np.float64)
+    family_choices = np.ascontiguousarray(np.asarray(family_choices)[:, :top_k], dtype=np.int64)
+    accounting = np.ascontiguousarray(build_accounting_table() if accounting is None else accounting, dtype=np.float64)
+    occupancy = daily_occupancy(assignment, family_size)
+
+    if not is_feasible(occupancy):
+        raise ValueError('Swap search needs a starting assignment within the attendance limits')
+
+    penalties = np.zeros(N_DAYS + 1)
+    penalties[1:] = accounting_penalties(occupancy)
+
+    start_timestamp = datetime.now()
+    stats = {'sweep': 0, 'evaluated': 0, 'accepted': 0, 'saved': 0.0}
+
+    while max_sweeps is None or stats['sweep'] < max_sweeps:
+        members = np.argsort(assignment, kind='stable')
+        member_offsets = np.searchsorted(assignment[members], np.arange(N_DAYS + 2))
+        order = rng.permutation(len(assignment))
+
+        evaluated, accepted, saved = chain_sweep(order, assignment, occupancy, penalties, accounting, family_size,
+                                                 cost_matrix, family_choices, member_offsets, members)
+
+        run_time = (datetime.now() - start_timestamp).total_seconds()
+        stats['sweep'] += 1
+        stats['evaluated'] += evaluated
+        stats['accepted'] += accepted
+        stats['saved'] += saved
+        stats['cost'] = float(cost_matrix[np.arange(len(assignment)), assignment].sum() + penalties.sum())
+        stats['run_time'] = run_time
+        stats['moves_per_second'] = stats['evaluated'] / max(run_time, 1e-9)
+
+        if callback is not None:
+            callback(dict(stats))
+
+        if accepted == 0 or (time_limit is not None and run_time >= time_limit):
+            break
+
+    return assignment, stats
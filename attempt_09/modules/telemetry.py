@@ -0,0 +1,258 @@
+# Import libraries ------------------------------------------------
+import re
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+NUMBER = r'[-+]?\d+(?:\.\d+)?(?:e[-+]?\d+)?'
+GRB_INFINITY = 1e100
+
+
+def log_value(token):
+    # Gurobi prints "-" for a missing value and 1e+100 for an objective it has not found, such as an infeasible start
+    if token == '-':
+        return None
+
+    value = float(token)
+
+    return None if value >= GRB_INFINITY else value
+
+
+# Parse Gurobi logs one line at a time ----------------------------
+# Node lines are read from the right, since the objective, depth and IntInf columns are missing on heuristic (H) lines
+# and replaced by "cutoff" or "infeasible" on pruned nodes.
+class GurobiLogParser:
+    patterns = {
+        'model': re.compile(r'^Optimize a model with (\d+) rows, (\d+) columns and (\d+) nonzeros'),
+        'mip_start': re.compile(r'^Loaded (?:user )?MIP start (?:from previous solve )?with objective (%s)' % NUMBER),
+        'root': re.compile(r'^Root relaxation: objective (%s), (\d+) iterations, (%s) seconds' % (NUMBER, NUMBER)),
+        'explored': re.compile(r'^Explored (\d+) nodes \((\d+) simplex iterations\) in (%s) seconds' % NUMBER),
+        'summary': re.compile(r'^Best objective (%s|-), best bound (%s|-), gap (%s|-)' % (NUMBER, NUMBER, NUMBER)),
+        'cut': re.compile(r'^  ([A-Za-z][A-Za-z -]*): (\d+)$'),
+    }
+
+    def __init__(self):
+        self.run = 0
+        self.in_cuts = False
+        self.cuts = {}
+
+    def feed(self, line):
+        line = line.rstrip('\n')
+        events = []
+
+        if line.startswith('Gurobi Optimizer version'):
+            self.run += 1
+            events.append({'type': 'run_start'})
+        elif line.startswith('Continuing optimization'):
+            events.append({'type': 'run_continue'})
+        elif line.startswith('Cutting planes:'):
+            self.in_cuts = True
+            self.cuts = {}
+        elif self.in_cuts:
+            match = self.patterns['cut'].match(line)
+
+            if match:
+                self.cuts[match.group(1)] = int(match.group(2))
+            else:
+                self.in_cuts = False
+                events.append({'type': 'cuts', 'cuts': dict(self.cuts)})
+        else:
+            events += self._parse_line(line)
+
+        for event in events:
+            event['run'] = self.run
+
+        return events
+
+    def _parse_line(self, line):
+        for name in ('model', 'mip_start', 'root', 'explored', 'summary'):
+            match = self.patterns[name].match(line)
+
+            if match:
+                values = [log_value(v) for v in match.groups()]
+                fields = {'model': ('rows', 'columns', 'nonzeros'), 'mip_start': ('incumbent',),
+                          'root': ('bound', 'iterations', 'run_time'), 'explored': ('nodes', 'iterations', 'run_time'),
+                          'summary': ('incumbent', 'bound', 'gap')}[name]
+
+                event = dict(zip(fields, values), type=name)
+
+                if name == 'summary' and event['gap'] is not None:
+                    event['gap'] /= 100
+
+                return [event]
+
+        return self._parse_progress(line)
+
+    def _parse_progress(self, line):
+        tokens = line.replace('%', ' ').split()
+
+        if len(tokens) < 7 or not re.match(r'^\d+s$', tokens[-1]):
+            return []
+
+        heuristic = tokens[0][0] in 'H*'
+        explored = tokens[0].lstrip('H*') or tokens[1]
+        rest = tokens[1:] if tokens[0].lstrip('H*') else tokens[2:]
+
+        try:
+            incumbent, bound = [log_value(t) for t in tokens[-5:-3]]
+            gap = None if tokens[-3] == '-' else float(tokens[-3]) / 100
+            nodes, unexplored = int(explored), int(rest[0])
+        except ValueError:
+            return []
+
+        return [{'type': 'progress', 'heuristic': heuristic, 'nodes': nodes, 'unexplored': unexplored,
+                 'incumbent': incumbent, 'bound': bound, 'gap': gap, 'run_time': float(tokens[-1][:-1])}]
+
+
+def follow(path, poll_interval=1.0, stop=None):
+    # Yield complete lines as they are appended to the log, like tail -f, until stop() returns True
+    while not os.path.exists(path):
+        if stop is not None and stop():
+            return
+
+        time.sleep(poll_interval)
+
+    with open(path) as f:
+        partial = ''
+
+        while True:
+            line = f.readline()
+
+            if line:
+                partial += line
+
+                if partial.endswith('\n'):
+                    yield partial
+                    partial = ''
+            elif stop is not None and stop():
+                return
+            else:
+                time.sleep(poll_interval)
+
+
+def parse_log(path, follow_log=False, poll_interval=1.0, stop=None):
+    parser = GurobiLogParser()
+
+    if follow_log:
+        for line in follow(path, poll_interval, stop):
+            yield from parser.feed(line)
+    else:
+        with open(path) as f:
+            for line in f:
+                yield from parser.feed(line)
+
+
+# Write time series to JSONL or Prometheus text -------------------
+class JsonlSink:
+    def __init__(self, path):
+        self.file = open(path, 'a')
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class PrometheusSink:
+    # Keeps the latest value of each numeric field per source and renders them in the Prometheus text format
+    fields = ('incumbent', 'bound', 'gap', 'nodes', 'moves_per_second', 'run_time')
+
+    def __init__(self, path=None, prefix='santa_tour'):
+        self.path = path
+        self.prefix = prefix
+        self.gauges = {}
+        self.lock = threading.Lock()
+
+    def write(self, record):
+        with self.lock:
+            for field in self.fields:
+                if record.get(field) is not None:
+                    self.gauges[(field, record['source'])] = record[field]
+
+        if self.path is not None:
+            with open(self.path + '.tmp', 'w') as f:
+                f.write(self.render())
+
+            os.replace(self.path + '.tmp', self.path)
+
+    def render(self):
+        with self.lock:
+            lines = []
+
+            for field in self.fields:
+                series = [(source, value) for (name, source), value in sorted(self.gauges.items()) if name == field]
+
+                if series:
+                    lines.append('# TYPE %s_%s gauge' % (self.prefix, field))
+                    lines += ['%s_%s{source="%s"} %s' % (self.prefix, field, source, repr(float(value)))
+                              for source, value in series]
+
+            return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9108):
+        # A minimal /metrics endpoint on a background thread
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = sink.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('', port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        return server
+
+    def close(self):
+        pass
+
+
+class Telemetry:
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def record(self, source, **fields):
+        record = dict(fields, source=source, time=datetime.now().isoformat())
+
+        for sink in self.sinks:
+            sink.write(record)
+
+    def callback(self, source, then=None):
+        # Adapts the progress dicts of the heuristics and solver backends, which report costs in their own terms
+        def record_progress(stats):
+            moves = stats.get('moves', stats.get('evaluated'))
+            moves_per_second = stats.get('moves_per_second')
+
+            if moves_per_second is None and moves is not None and stats.get('run_time'):
+                moves_per_second = moves / stats['run_time']
+
+            incumbent = next((stats[k] for k in ('best_cost', 'cost', 'objective') if stats.get(k) is not None), None)
+            self.record(source, incumbent=incumbent, bound=stats.get('best_bound', stats.get('bound')),
+                        gap=stats.get('gap'), moves_per_second=moves_per_second, run_time=stats.get('run_time'))
+
+            if then is not None:
+                then(stats)
+
+        return record_progress
+
+    def record_log(self, path, source='gurobi', follow_log=False, poll_interval=1.0, stop=None):
+        # Forward node progress and solve summaries from a Gurobi log
+        for event in parse_log(path, follow_log, poll_interval, stop):
+            if event['type'] in ('progress', 'summary', 'root', 'mip_start'):
+                self.record(source, **event)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
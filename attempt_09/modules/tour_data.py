@@ -0,0 +1,74 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# Define indices and data -----------------------------------------
+N_FAMILIES = 5000
+N_DAYS = 100
+N_CHOICES = 10
+MIN_OCCUPANCY = 125
+MAX_OCCUPANCY = 300
+ATTENDANCE_RANGE = np.arange(MIN_OCCUPANCY, MAX_OCCUPANCY + 1)
+
+# Gift card and per-person cost by choice, with the last row for any day outside the top 10
+PREFERENCE_COST_SCHEDULE = np.array([[0, 0],
+                                     [50, 0],
+                                     [50, 9],
+                                     [100, 9],
+                                     [200, 9],
+                                     [200, 18],
+                                     [300, 18],
+                                     [300, 36],
+                                     [400, 36],
+                                     [500, 36 + 199],
+                                     [500, 36 + 398]], dtype=np.int32)
+
+FamilyData = namedtuple('FamilyData', ['family_size', 'family_choices', 'preference_cost'])
+
+
+# Build preference cost and choice matrices -----------------------
+def preference_cost_matrix(family_size, family_choices):
+    gift_cost = PREFERENCE_COST_SCHEDULE[:, 0]
+    person_cost = PREFERENCE_COST_SCHEDULE[:, 1]
+    choice_cost = gift_cost[None, :] + person_cost[None, :] * family_size[:, None]
+
+    # Column 0 is unused so that days can index the matrix directly
+    cost_matrix = np.empty((len(family_size), N_DAYS + 1), dtype=np.int32)
+    cost_matrix[:, :] = choice_cost[:, N_CHOICES, None]
+    cost_matrix[:, 0] = 0
+    cost_matrix[np.arange(len(family_size))[:, None], family_choices] = choice_cost[:, :N_CHOICES]
+
+    return cost_matrix
+
+
+def read_family_data(path):
+    family_data = pd.read_csv(path).sort_values('family_id')
+    family_size = family_data['n_people'].values.astype(np.int32)
+    family_choices = family_data[['choice_%d' % c for c in range(N_CHOICES)]].values.astype(np.int32)
+
+    return FamilyData(family_size, family_choices, preference_cost_matrix(family_size, family_choices))
+
+
+# Build accounting cost lookup table ------------------------------
+# table[a - 125, b - 125] is the penalty for a visitors today and b visitors on the following day.
+# The cost does not depend on the day itself, and day 100 is the diagonal of the same table.
+def build_accounting_table():
+    today_visitors = ATTENDANCE_RANGE[:, None].astype(np.float64)
+    yesterday_visitors = ATTENDANCE_RANGE[None, :].astype(np.float64)
+
+    return (today_visitors - 125.0) / 400.0 * today_visitors ** \
+        (0.5 + np.abs(today_visitors - yesterday_visitors) / 50.0)
+
+
+# List the (day, day_0, day_1) accounting variables of the MIP ----
+def accounting_options(table, cutoff=None):
+    allowed = np.ones(table.shape, dtype=bool) if cutoff is None else table < cutoff
+    day_0, day_1 = np.nonzero(allowed)
+    diagonal = np.nonzero(np.diag(allowed))[0]
+
+    day = np.concatenate([np.repeat(np.arange(1, N_DAYS), len(day_0)), np.full(len(diagonal), N_DAYS)])
+    day_0 = np.concatenate([np.tile(day_0, N_DAYS - 1), diagonal]) + MIN_OCCUPANCY
+    day_1 = np.concatenate([np.tile(day_1, N_DAYS - 1), diagonal]) + MIN_OCCUPANCY
+
+    return day.astype(np.int16), day_0.astype(np.int16), day_1.astype(np.int16)
@@ -0,0 +1,235 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import scipy.sparse as sp
+from collections import namedtuple
+from datetime import datetime
+
+from tour_data import N_DAYS, N_CHOICES, MIN_OCCUPANCY, MAX_OCCUPANCY, ATTENDANCE_RANGE
+from model_index import build_model_index
+
+# Columns are laid out as [visit | attendance | accounting] and every row is an equality
+TourProblem = namedtuple('TourProblem', ['objective', 'lower', 'upper', 'vtype', 'constraint_matrix', 'rhs',
+                                         'visit_family', 'visit_day', 'accounting_day', 'accounting_day_0',
+                                         'accounting_day_1', 'index'])
+
+
+# Time each phase of model construction ---------------------------
+class PhaseTimer:
+    def __init__(self):
+        self.timings = {}
+        self._timestamp = datetime.now()
+
+    def lap(self, phase):
+        timestamp = datetime.now()
+        self.timings[phase] = self.timings.get(phase, 0.0) + (timestamp - self._timestamp).total_seconds()
+        self._timestamp = timestamp
+
+
+# Build model data from the NumPy cost arrays ---------------------
+def build_problem(family_size, family_choices, preference_cost, accounting_cost, accounting_options,
+                  top_k=N_CHOICES, visit_options=None, fixed_people=None, timer=None):
+    timer = timer or PhaseTimer()
+    accounting_day, accounting_day_0, accounting_day_1 = [np.asarray(a, dtype=np.int64) for a in accounting_options]
+
+    # Sub-problems pass their own (family, day) columns and the people already fixed on each day
+    if visit_options is None:
+        visit_family = np.repeat(np.arange(len(family_size)), top_k)
+        visit_day = np.asarray(family_choices)[:, :top_k].astype(np.int64).ravel()
+    else:
+        visit_family, visit_day = [np.asarray(v, dtype=np.int64) for v in visit_options]
+
+    families, family_row = np.unique(visit_family, return_inverse=True)
+    n_families = len(families)
+    n_visit = len(visit_family)
+    n_accounting = len(accounting_day)
+    attendance_offset = n_visit
+    accounting_offset = n_visit + N_DAYS
+
+    objective = np.concatenate([preference_cost[visit_family, visit_day].astype(np.float64),
+                                np.zeros(N_DAYS),
+                                accounting_cost[accounting_day_0 - MIN_OCCUPANCY, accounting_day_1 - MIN_OCCUPANCY]])
+    lower = np.concatenate([np.zeros(n_visit), np.full(N_DAYS, MIN_OCCUPANCY), np.zeros(n_accounting)])
+    upper = np.concatenate([np.ones(n_visit), np.full(N_DAYS, MAX_OCCUPANCY), np.ones(n_accounting)])
+    vtype = np.concatenate([np.full(n_visit, 'B'), np.full(N_DAYS, 'I'), np.full(n_accounting, 'B')])
+    timer.lap('columns')
+
+    index = build_model_index(visit_family, visit_day, accounting_day, accounting_day_0, accounting_day_1)
+    timer.lap('index')
+
+    days = np.arange(1, N_DAYS + 1)
+    attendance_columns = attendance_offset + days - 1
+    n_range = len(ATTENDANCE_RANGE)
+
+    # Row offsets of each constraint family
+    set_attendance = 0
+    attendance_today = set_attendance + N_DAYS
+    attendance_yesterday = attendance_today + N_DAYS
+    one_accounting = attendance_yesterday + N_DAYS
+    attendance_equality = one_accounting + N_DAYS
+    one_visit = attendance_equality + (N_DAYS - 1) * n_range
+    n_rows = one_visit + n_families
+
+    # Set_Attendance_d: people visiting on day d equal attendance[d]
+    group, column = index.visit_by_day.groups()
+    rows = [set_attendance + group, set_attendance + days - 1]
+    columns = [column, attendance_columns]
+    values = [np.asarray(family_size)[visit_family[column]].astype(np.float64), -np.ones(N_DAYS)]
+
+    # Force_Accounting_Attendance_Today_d and _Yesterday_d
+    group, column = index.accounting_by_day.groups()
+    rows += [attendance_today + group, attendance_today + days - 1]
+    columns += [accounting_offset + column, attendance_columns]
+    values += [accounting_day_0[column].astype(np.float64), -np.ones(N_DAYS)]
+
+    rows += [attendance_yesterday + group, attendance_yesterday + days - 1]
+    columns += [accounting_offset + column, attendance_offset + np.minimum(days + 1, N_DAYS) - 1]
+    values += [accounting_day_1[column].astype(np.float64), -np.ones(N_DAYS)]
+
+    # One_Accounting_Variable_Per_Day_d
+    rows += [one_accounting + group]
+    columns += [accounting_offset + column]
+    values += [np.ones(len(column))]
+
+    # Force_Accounting_Attendance_Equality_d_w links day_1 = w of day d with day_0 = w of day d + 1
+    group, column = index.accounting_by_day_1.groups(0, (N_DAYS - 1) * n_range)
+    rows += [attendance_equality + group]
+    columns += [accounting_offset + column]
+    values += [np.ones(len(column))]
+
+    group, column = index.accounting_by_day_0.groups(n_range, N_DAYS * n_range)
+    rows += [attendance_equality + group - n_range]
+    columns += [accounting_offset + column]
+    values += [-np.ones(len(column))]
+
+    # One_Visit_Per_Family_f
+    group, column = index.visit_by_family.groups()
+    rows += [one_visit + family_row[column]]
+    columns += [column]
+    values += [np.ones(len(column))]
+
+    rhs = np.zeros(n_rows)
+
+    if fixed_people is not None:
+        rhs[set_attendance:set_attendance + N_DAYS] = -np.asarray(fixed_people)[1:N_DAYS + 1]
+
+    rhs[one_accounting:one_accounting + N_DAYS] = 1
+    rhs[one_visit:] = 1
+
+    constraint_matrix = sp.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+                                      shape=(n_rows, len(objective)))
+    timer.lap('rows')
+
+    return TourProblem(objective, lower, upper, vtype, constraint_matrix, rhs,
+                       visit_family, visit_day, accounting_day, accounting_day_0, accounting_day_1, index)
+
+
+# Name columns and rows as in the attempt_08 model ----------------
+def column_names(problem):
+    return ['x_%d_%d' % (f, d) for f, d in zip(problem.visit_family.tolist(), problem.visit_day.tolist())] + \
+        ['attendance_%d' % d for d in range(1, N_DAYS + 1)] + \
+        ['accounting_%d_%d_%d' % (d, a, b) for d, a, b in zip(problem.accounting_day.tolist(),
+                                                              problem.accounting_day_0.tolist(),
+                                                              problem.accounting_day_1.tolist())]
+
+
+def row_names(problem):
+    days = range(1, N_DAYS + 1)
+
+    return ['Set_Attendance_%d' % d for d in days] + \
+        ['Force_Accounting_Attendance_Today_%d' % d for d in days] + \
+        ['Force_Accounting_Attendance_Yesterday_%d' % d for d in days] + \
+        ['One_Accounting_Variable_Per_Day_%d' % d for d in days] + \
+        ['Force_Accounting_Attendance_Equality_%d_%d' % (d, w)
+         for d in range(1, N_DAYS) for w in ATTENDANCE_RANGE] + \
+        ['One_Visit_Per_Family_%d' % f for f in np.unique(problem.visit_family)]
+
+
+# Build sub-problems that re-optimize a subset of families --------
+def restrict_accounting_options(accounting_options, lower, upper):
+    # lower and upper hold the allowed attendance of each day, indexed by day
+    day, day_0, day_1 = [np.asarray(a, dtype=np.int64) for a in accounting_options]
+    next_day = np.minimum(day + 1, N_DAYS)
+    keep = (day_0 >= lower[day]) & (day_0 <= upper[day]) & (day_1 >= lower[next_day]) & (day_1 <= upper[next_day])
+
+    return day[keep], day_0[keep], day_1[keep]
+
+
+def build_subset_problem(assignment, free_families, family_size, family_choices, preference_cost, accounting_cost,
+                         accounting_options, top_k=N_CHOICES, allowed_days=None, timer=None):
+    assignment = np.asarray(assignment, dtype=np.int64)
+    family_size = np.asarray(family_size, dtype=np.int64)
+    free_families = np.asarray(free_families, dtype=np.int64)
+
+    # Free families may move to any top_k choice on an allowed day, or stay where they are
+    allowed = np.ones(N_DAYS + 1, dtype=bool) if allowed_days is None else allowed_days
+    choices = np.asarray(family_choices)[free_families, :top_k].astype(np.int64)
+    visit_family = np.concatenate([np.repeat(free_families, top_k), free_families])
+    visit_day = np.concatenate([choices.ravel(), assignment[free_families]])
+    keep = allowed[visit_day] | (visit_day == assignment[visit_family])
+    visit_options = np.unique(np.stack([visit_family[keep], visit_day[keep]], axis=1), axis=0).T
+
+    # Days the free families can reach are held between the fixed people and everyone who could come
+    occupancy = np.bincount(assignment, weights=family_size, minlength=N_DAYS + 1).astype(np.int64)
+    fixed_people = occupancy - np.bincount(assignment[free_families], weights=family_size[free_families],
+                                           minlength=N_DAYS + 1).astype(np.int64)
+    potential_people = fixed_people + np.bincount(visit_options[1], weights=family_size[visit_options[0]],
+                                                  minlength=N_DAYS + 1).astype(np.int64)
+    reached = np.bincount(visit_options[1], minlength=N_DAYS + 1) > 0
+    lower = np.where(reached, np.maximum(fixed_people, MIN_OCCUPANCY), occupancy)
+    upper = np.where(reached, np.minimum(potential_people, MAX_OCCUPANCY), occupancy)
+
+    problem = build_problem(family_size, family_choices, preference_cost, accounting_cost,
+                            restrict_accounting_options(accounting_options, lower, upper),
+                            visit_options=visit_options, fixed_people=fixed_people, timer=timer)
+
+    # Preference cost of the families that stay fixed, so that objectives stay comparable
+    fixed_families = np.setdiff1d(np.arange(len(assignment)), free_families)
+    fixed_cost = float(np.asarray(preference_cost)[fixed_families, assignment[fixed_families]].sum())
+
+    return problem, fixed_cost
+
+
+def build_window_problem(assignment, window_days, family_size, family_choices, preference_cost, accounting_cost,
+                         accounting_options, top_k=N_CHOICES, timer=None):
+    in_window = np.zeros(N_DAYS + 1, dtype=bool)
+    in_window[window_days] = True
+
+    # Families in the window may only move within it
+    free_families = np.nonzero(in_window[np.asarray(assignment)])[0]
+
+    return build_subset_problem(assignment, free_families, family_size, family_choices, preference_cost,
+                                accounting_cost, accounting_options, top_k=top_k, allowed_days=in_window, timer=timer)
+
+
+# Translate between schedules and column values -------------------
+def start_values(problem, assignment, family_size):
+    # One vectorized pass per column block, so a full 1.4M-column start takes milliseconds
+    assignment = np.asarray(assignment, dtype=np.int64)
+    occupancy = np.bincount(assignment, weights=family_size, minlength=N_DAYS + 1).astype(np.int64)
+    next_day = np.minimum(problem.accounting_day + 1, N_DAYS)
+
+    visit = problem.visit_day == assignment[problem.visit_family]
+    attendance = occupancy[1:N_DAYS + 1]
+    accounting = (problem.accounting_day_0 == occupancy[problem.accounting_day]) & \
+        (problem.accounting_day_1 == occupancy[next_day])
+
+    return np.concatenate([visit, attendance, accounting]).astype(np.float64)
+
+
+def assignment_from_values(problem, values):
+    # The visit column with the largest value for each family, found over the CSR layout of the index
+    columns = problem.index.visit_by_family.argmax(np.asarray(values)[:len(problem.visit_family)])
+
+    if np.any(columns < 0):
+        raise ValueError('Every family needs at least one visit column')
+
+    return problem.visit_day[columns]
+
+
+def extract_assignment(problem, values, assignment):
+    # Families without a visit column in the sub-problem keep their day
+    assignment = np.array(assignment, dtype=np.int64)
+    chosen = np.asarray(values)[:len(problem.visit_family)] > 0.5
+    assignment[problem.visit_family[chosen]] = problem.visit_day[chosen]
+
+    return assignment
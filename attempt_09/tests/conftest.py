@@ -0,0 +1,26 @@
+# Import libraries ------------------------------------------------
+import os
+import sys
+
+import pytest
+
+# The modules import each other by name, as they do when run from attempt_09/modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'modules'))
+
+from tour_data import read_family_data  # noqa: E402
+from solution_io import read_assignment  # noqa: E402
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'family_data.csv')
+SOLUTION_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'attempt_08', 'outputs',
+                             'tour_solution_68898.csv')
+
+
+# Share the input data across tests -------------------------------
+@pytest.fixture(scope='session')
+def family_data():
+    return read_family_data(INPUT_PATH)
+
+
+@pytest.fixture(scope='session')
+def solution():
+    return read_assignment(SOLUTION_PATH)
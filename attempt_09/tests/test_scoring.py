@@ -0,0 +1,33 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import pytest
+
+from tour_data import N_DAYS
+from scoring import DeltaEvaluator, total_cost
+
+
+# Check incremental deltas against a full rescore -----------------
+def test_move_and_swap_deltas_match_full_rescore(family_data, solution):
+    family_members, _, preference_cost = family_data
+    evaluator = DeltaEvaluator(solution, preference_cost, family_members)
+    rng = np.random.default_rng(0)
+
+    assert evaluator.total_cost == pytest.approx(total_cost(solution, preference_cost, family_members))
+
+    for _ in range(500):
+        before = total_cost(evaluator.assignment, preference_cost, family_members)
+
+        if rng.random() < 0.5:
+            family, day = int(rng.integers(len(solution))), int(rng.integers(1, N_DAYS + 1))
+            delta = evaluator.move_delta(family, day)
+            applied = evaluator.move(family, day)
+        else:
+            family_a, family_b = (int(f) for f in rng.integers(len(solution), size=2))
+            delta = evaluator.swap_delta(family_a, family_b)
+            applied = evaluator.swap(family_a, family_b)
+
+        after = total_cost(evaluator.assignment, preference_cost, family_members)
+
+        assert delta == pytest.approx(after - before, abs=1e-6)
+        assert applied == pytest.approx(delta)
+        assert evaluator.total_cost == pytest.approx(after)
@@ -0,0 +1,30 @@
+# Import libraries ------------------------------------------------
+import numpy as np
+import pytest
+
+from scoring import total_cost
+from solution_io import read_solution_sol, write_solution_sol
+
+
+# Round trip Gurobi solution files --------------------------------
+def test_sol_round_trip(family_data, solution, tmp_path):
+    family_members, _, preference_cost = family_data
+    path = str(tmp_path / 'tour_solution.sol')
+    write_solution_sol(path, solution, family_members, total_cost(solution, preference_cost, family_members))
+
+    assert np.array_equal(read_solution_sol(path), solution)
+
+
+def test_partial_sol_is_rejected(family_data, solution, tmp_path):
+    family_members, _, _ = family_data
+    path = str(tmp_path / 'tour_solution.sol')
+    write_solution_sol(path, solution, family_members, 0.0, accounting=False)
+
+    with open(path) as f:
+        lines = f.readlines()
+
+    with open(path, 'w') as f:
+        f.writelines(lines[:-1])
+
+    with pytest.raises(ValueError, match='tour_solution.sol'):
+        read_solution_sol(path)